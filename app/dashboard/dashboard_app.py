@@ -1,20 +1,115 @@
 import logging
+from datetime import date
 
 import streamlit as st
 
-from app.dashboard.data_vacuum import load_bulk, load_today
-from app.dashboard.draw_cpu_aggregate_plot import draw_cpu_aggregate_plot
+from app.dashboard.data_vacuum import (
+    LiveTail,
+    TodaysData,
+    load_bulk,
+    load_past_day,
+    load_today,
+)
+from app.dashboard.draw_collector_aggregate_plot import (
+    COLLECTOR_AGGREGATE_FIELDS,
+    draw_collector_aggregate_plot,
+)
+from app.dashboard.draw_collector_plot import draw_collector_plot
+from app.dashboard.draw_cpu_aggregate_plot import (
+    CPU_AGGREGATE_FIELDS,
+    draw_cpu_aggregate_plot,
+)
 from app.dashboard.draw_cpu_plot import draw_cpu_plot
-from app.dashboard.draw_gpu_aggregate_plot import draw_gpu_aggregate_plot
+from app.dashboard.draw_gpu_aggregate_plot import (
+    GPU_AGGREGATE_FIELDS,
+    draw_gpu_aggregate_plot,
+)
 from app.dashboard.draw_gpu_plot import draw_gpu_plot
-from app.dashboard.draw_network_aggregate_plot import draw_network_aggregate_plot
+from app.dashboard.draw_logger_aggregate_plot import (
+    LOGGER_AGGREGATE_FIELDS,
+    draw_logger_aggregate_plot,
+)
+from app.dashboard.draw_logger_plot import draw_logger_plot
+from app.dashboard.draw_network_aggregate_plot import (
+    NETWORK_AGGREGATE_FIELDS,
+    draw_network_aggregate_plot,
+)
 from app.dashboard.draw_network_plot import draw_network_plot
-from app.dashboard.draw_ups_aggregate_plot import draw_ups_aggregate_plot
+from app.dashboard.draw_ups_aggregate_plot import (
+    UPS_AGGREGATE_FIELDS,
+    draw_ups_aggregate_plot,
+)
 from app.dashboard.draw_ups_plot import draw_ups_plot
 from app.shared.initialize_logs import initialize_logs
+from app.shared.segment_archive import list_days
 
 initialize_logs("frontend")
 
+AGGREGATE_RESOLUTIONS = {
+    "Daily": "1d",
+    "Hourly": "1h",
+    "15 minutes": "15m",
+    "1 minute": "1m",
+}
+
+RAW_TYPES = {
+    "CPU": "CpuData",
+    "GPU": "GpuData",
+    "Network": "NetworkData",
+    "UPS": "UpsData",
+    "Logger": "LoggerData",
+    "Collectors": "CollectorData",
+}
+
+AGGREGATE_TYPES = {
+    "CPU": "CpuAggregatedData",
+    "GPU": "GpuAggregatedData",
+    "Network": "NetworkAggregatedData",
+    "UPS": "UpsAggregatedData",
+    "Logger": "LoggerAggregatedData",
+    "Collectors": "CollectorAggregatedData",
+}
+
+AGGREGATE_FIELDS = {
+    "CPU": CPU_AGGREGATE_FIELDS,
+    "GPU": GPU_AGGREGATE_FIELDS,
+    "Network": NETWORK_AGGREGATE_FIELDS,
+    "UPS": UPS_AGGREGATE_FIELDS,
+    "Logger": LOGGER_AGGREGATE_FIELDS,
+    "Collectors": COLLECTOR_AGGREGATE_FIELDS,
+}
+
+LAST_24_HOURS = "Last 24 hours"
+LIVE_REFRESH_SECONDS = 5.0
+
+
+def draw_raw_plot(
+    plot_key: str, todays_data: TodaysData, time_range: float | None
+) -> None:
+    plot_function, plot_data = {
+        "CPU": (draw_cpu_plot, todays_data.cpu),
+        "GPU": (draw_gpu_plot, todays_data.gpu),
+        "Network": (draw_network_plot, todays_data.network),
+        "UPS": (draw_ups_plot, todays_data.ups),
+        "Logger": (draw_logger_plot, todays_data.logger),
+        "Collectors": (draw_collector_plot, todays_data.collectors),
+    }[plot_key]
+    plot_function(plot_data, time_range)
+
+
+@st.fragment(run_every=LIVE_REFRESH_SECONDS)
+def draw_live_plot(plot_key: str, time_range: float) -> None:
+    # reruns on its own, without reloading the rest of the page
+    live_tail = st.session_state.get("live_tail")
+    if (
+        live_tail is None
+        or live_tail.time_range != time_range
+        or live_tail.type_name != RAW_TYPES[plot_key]
+    ):
+        live_tail = LiveTail(time_range, RAW_TYPES[plot_key])
+        st.session_state["live_tail"] = live_tail
+    draw_raw_plot(plot_key, live_tail.update(), time_range)
+
 
 def main() -> None:
     logger = logging.getLogger("frontend")
@@ -26,7 +121,7 @@ def main() -> None:
     show_aggregates = st.sidebar.checkbox("Show aggregates", value=False)
     plot_key = st.sidebar.selectbox(
         "Select plot",
-        ["CPU", "GPU", "Network", "UPS"],
+        ["CPU", "GPU", "Network", "UPS", "Logger", "Collectors"],
     )
 
     if plot_key is None:
@@ -38,7 +133,9 @@ def main() -> None:
 
     if show_aggregates:
         logger.debug("Showing aggregates")
-        aggregate_data = load_bulk()
+        resolution = st.sidebar.selectbox(
+            "Aggregate resolution", list(AGGREGATE_RESOLUTIONS.keys())
+        )
         show_all = st.sidebar.checkbox("Show all", value=False)
         if show_all:
             logger.debug("Showing all data")
@@ -47,29 +144,44 @@ def main() -> None:
             time_range = st.sidebar.slider("Plot time range (days)", 0.0, 60.0, 30.0)
             time_range *= 3600 * 24
             logger.debug(f"Aggregate time range: {time_range}")
+        # only the plotted type, columns and time range are read from the store
+        aggregate_data = load_bulk(
+            AGGREGATE_RESOLUTIONS[resolution or "Daily"],
+            time_range,
+            AGGREGATE_TYPES[plot_key],
+            AGGREGATE_FIELDS[plot_key],
+        )
 
         plot_function, plot_data = {
             "CPU": (draw_cpu_aggregate_plot, aggregate_data.cpu),
             "GPU": (draw_gpu_aggregate_plot, aggregate_data.gpu),
             "Network": (draw_network_aggregate_plot, aggregate_data.network),
             "UPS": (draw_ups_aggregate_plot, aggregate_data.ups),
+            "Logger": (draw_logger_aggregate_plot, aggregate_data.logger),
+            "Collectors": (draw_collector_aggregate_plot, aggregate_data.collectors),
         }[plot_key]
 
         plot_function(plot_data, time_range)
     else:
-        logger.debug("Showing today's data")
-        with st.spinner("Loading data..."):
-            todays_data = load_today()
-        time_range = st.sidebar.slider("Plot time range (hours)", 0.05, 24.0, 1.0)
-        time_range *= 3600
-        logger.debug(f"Today time range: {time_range}")
-
-        plot_function, plot_data = {
-            "CPU": (draw_cpu_plot, todays_data.cpu),
-            "GPU": (draw_gpu_plot, todays_data.gpu),
-            "Network": (draw_network_plot, todays_data.network),
-            "UPS": (draw_ups_plot, todays_data.ups),
-        }[plot_key]
+        past_days = [day.isoformat() for day in reversed(list_days())]
+        day = st.sidebar.selectbox("Raw data", [LAST_24_HOURS] + past_days)
+        if day is None or day == LAST_24_HOURS:
+            logger.debug("Showing today's data")
+            time_range = st.sidebar.slider("Plot time range (hours)", 0.05, 24.0, 1.0)
+            time_range *= 3600
+            logger.debug(f"Today time range: {time_range}")
+            if st.sidebar.toggle("Live", value=False):
+                logger.debug("Showing live data")
+                draw_live_plot(plot_key, time_range)
+                return
+            st.session_state.pop("live_tail", None)
+            with st.spinner("Loading data..."):
+                todays_data = load_today(time_range, RAW_TYPES[plot_key])
+        else:
+            logger.debug(f"Showing archived data for {day}")
+            time_range = None
+            with st.spinner("Decompressing data..."):
+                todays_data = load_past_day(date.fromisoformat(day))
 
         with st.spinner("Rendering plots..."):
-            plot_function(plot_data, time_range)
+            draw_raw_plot(plot_key, todays_data, time_range)
@@ -1,159 +1,238 @@
-import hashlib
 import logging
+import time
 from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import get_args
 
+import numpy as np
 import streamlit as st
 
+from app.dashboard.draw_utils import PLOT_WIDTH
+from app.query_service.hot_data import HotData, SeriesQuery
+from app.query_service.query_client import QueryClient
 from app.shared import (
     CpuAggregatedData,
     CpuData,
-    GpuAggregatedData,
-    GpuData,
-    NetworkAggregatedData,
-    NetworkData,
+    LoggerAggregatedData,
+    LoggerData,
     UpsAggregatedData,
     UpsData,
 )
 from app.shared.aggregate_utils import (
-    get_aggregate_class,
-    get_data_class,
-    group_by_key,
-    group_by_type,
+    AGGREGATE_CLASSES,
+    DATA_CLASSES,
+    DEFAULT_SERIES_KEY,
+    SERIES_KEY_FIELDS,
+    decode_data,
 )
-from app.shared.constants import BULK_DATA, TODAYS_DATA, YESTERDAYS_DATA
-from app.shared.read_json_lines import read_json_lines
+from app.shared.column_series import (
+    ColumnSeries,
+    SeriesKey,
+    SeriesMap,
+    group_into_series,
+)
+from app.shared.column_store import ColumnStoreReader
+from app.shared.constants import COLUMN_DATA, STORAGE_ENGINE
+from app.shared.segment_archive import read_day
 from app.shared.types import DataImpl
 
 
 @dataclass
 class AggregatedData:
-    cpu: list[CpuAggregatedData] = field(default_factory=list)
-    gpu: dict[str, list[GpuAggregatedData]] = field(default_factory=dict)
-    network: dict[str, list[NetworkAggregatedData]] = field(default_factory=dict)
-    ups: list[UpsAggregatedData] = field(default_factory=list)
-    data_hash: str = ""
+    cpu: ColumnSeries = field(default_factory=lambda: ColumnSeries(CpuAggregatedData))
+    gpu: dict[str, ColumnSeries] = field(default_factory=dict)
+    network: dict[str, ColumnSeries] = field(default_factory=dict)
+    ups: ColumnSeries = field(default_factory=lambda: ColumnSeries(UpsAggregatedData))
+    logger: ColumnSeries = field(
+        default_factory=lambda: ColumnSeries(LoggerAggregatedData)
+    )
+    collectors: dict[str, ColumnSeries] = field(default_factory=dict)
 
 
 @dataclass
 class TodaysData:
-    cpu: list[CpuData] = field(default_factory=list)
-    gpu: dict[str, list[GpuData]] = field(default_factory=dict)
-    network: dict[str, list[NetworkData]] = field(default_factory=dict)
-    ups: list[UpsData] = field(default_factory=list)
-
+    cpu: ColumnSeries = field(default_factory=lambda: ColumnSeries(CpuData))
+    gpu: dict[str, ColumnSeries] = field(default_factory=dict)
+    network: dict[str, ColumnSeries] = field(default_factory=dict)
+    ups: ColumnSeries = field(default_factory=lambda: ColumnSeries(UpsData))
+    logger: ColumnSeries = field(default_factory=lambda: ColumnSeries(LoggerData))
+    collectors: dict[str, ColumnSeries] = field(default_factory=dict)
 
-def compute_md5_hash(fname: str) -> str:
-    hash_md5 = hashlib.md5()
-    hash_md5.update(open(fname, "rb").read())
-    return hash_md5.hexdigest()
 
+def series_of_type(series: SeriesMap, type_name: str) -> dict[str, ColumnSeries]:
+    return {key: value for (name, key), value in series.items() if name == type_name}
 
-def did_bulk_data_change() -> bool:
-    return compute_md5_hash(BULK_DATA) != load_bulk_cache().data_hash
 
-
-@st.cache_data
-def load_bulk_cache() -> AggregatedData:
-    logger = logging.getLogger("frontend")
+def parse_aggregate_series(series: SeriesMap) -> AggregatedData:
     aggregate = AggregatedData()
-    data = []
-    with open(BULK_DATA, "rb") as file:
-        for data_dict in read_json_lines(file):
-            row = get_aggregate_class(data_dict).from_dict(data_dict)
-            data.append(row)
-    logger.debug(f"Loaded {len(data)} rows")
-    grouped_by_type = group_by_type(data)
-
-    aggregate.cpu = grouped_by_type.get("CpuAggregatedData", [])
-    aggregate.gpu = group_by_key(grouped_by_type.get("GpuAggregatedData", []), "uuid")
-    aggregate.network = group_by_key(
-        grouped_by_type.get("NetworkAggregatedData", []), "destination"
+    aggregate.cpu = series.get(("CpuAggregatedData", DEFAULT_SERIES_KEY), aggregate.cpu)
+    aggregate.gpu = series_of_type(series, "GpuAggregatedData")
+    aggregate.network = series_of_type(series, "NetworkAggregatedData")
+    aggregate.ups = series.get(("UpsAggregatedData", DEFAULT_SERIES_KEY), aggregate.ups)
+    aggregate.logger = series.get(
+        ("LoggerAggregatedData", DEFAULT_SERIES_KEY), aggregate.logger
     )
-    aggregate.ups = grouped_by_type.get("UpsAggregatedData", [])
-    aggregate.data_hash = compute_md5_hash(BULK_DATA)
-
+    aggregate.collectors = series_of_type(series, "CollectorAggregatedData")
     return aggregate
 
 
-def load_bulk() -> AggregatedData:
-    if did_bulk_data_change():
-        load_bulk_cache.clear()
-    return load_bulk_cache()
+SeriesSource = QueryClient | HotData
 
 
-def did_yesterday_change() -> bool:
-    new_hash = compute_md5_hash(YESTERDAYS_DATA)
-    old_hash = load_yesterday()[1]
-    logger = logging.getLogger("frontend")
-    logger.debug(f"{YESTERDAYS_DATA} Old hash: {old_hash}, New hash: {new_hash}")
-    return new_hash != old_hash
+def series_keys(
+    source: SeriesSource, type_name: str, resolution: str = "1d"
+) -> list[str]:
+    if SERIES_KEY_FIELDS[type_name] is None:
+        return [DEFAULT_SERIES_KEY]
+    # GPUs and destinations can come and go, so they are listed each time
+    return source.keys(resolution, type_name).get(type_name, [])
 
 
-@st.cache_data
-def load_yesterday() -> tuple[list[DataImpl], str]:
-    logger = logging.getLogger("frontend")
-    data = []
-    with open(YESTERDAYS_DATA, "rb") as file:
-        for data_dict in read_json_lines(file):
-            data.append(get_data_class(data_dict).from_dict(data_dict))
-    logger.debug(f"Loaded {len(data)} rows from {YESTERDAYS_DATA}")
-    return data, compute_md5_hash(YESTERDAYS_DATA)
+def fetch_from(source: SeriesSource, type_names: list[str], **query) -> SeriesMap:
+    series = {}
+    for type_name in type_names:
+        for key in series_keys(source, type_name, query.get("resolution", "1d")):
+            series[(type_name, key)] = source.series(
+                SeriesQuery(type_name, key, **query)
+            )
+    return series
 
 
-@dataclass
-class TodayCache:
-    parsed_data: list[DataImpl] = field(default_factory=list)
-    seek: int = 0
+def fetch_series(type_names: list[str], **query) -> SeriesMap:
+    """
+    Hot data from the query service. When it isn't running, the same queries go to
+    an in process HotData, which reads the files itself.
+    """
+    logger = logging.getLogger("frontend")
+    query.setdefault("max_points", 2 * PLOT_WIDTH)  # no more than a plot draws
+    try:
+        return fetch_from(QUERY_CLIENT, type_names, **query)
+    except OSError as e:
+        logger.debug(f"Query service unavailable, reading files: {e}")
+    return fetch_from(LOCAL_DATA, type_names, **query)
+
+
+def load_bulk(
+    resolution: str = "1d",
+    time_range: float | None = None,
+    type_name: str | None = None,
+    fields: list[str] | None = None,
+) -> AggregatedData:
+    """
+    Fields limits the columns read from the query service and the aggregate store,
+    the JSON lines files are always parsed whole.
+    """
+    start_time = None if time_range is None else time.time() - time_range
+    type_names = [type_name] if type_name is not None else list(AGGREGATE_CLASSES)
+    return parse_aggregate_series(
+        fetch_series(type_names, resolution=resolution, start=start_time, fields=fields)
+    )
 
 
-TODAY_DATA_CACHE = TodayCache()
+QUERY_CLIENT = QueryClient()
+LOCAL_DATA = HotData(logger_name="frontend")
 
 
-def load_today_cache() -> list[DataImpl]:
-    logger = logging.getLogger("frontend")
-    with open(TODAYS_DATA, "rb") as file:
-        file.seek(TODAY_DATA_CACHE.seek)
-        data = []
-        for data_dict in read_json_lines(file):
-            data.append(get_data_class(data_dict).from_dict(data_dict))
-        TODAY_DATA_CACHE.seek = file.tell()
-        TODAY_DATA_CACHE.parsed_data.extend(data)
-        logger.debug(
-            f"Loaded {len(data)} rows from {TODAYS_DATA}. Seek: {TODAY_DATA_CACHE.seek}"
-        )
-        return TODAY_DATA_CACHE.parsed_data
+def merge_series(series_maps: list[SeriesMap]) -> SeriesMap:
+    series: SeriesMap = {}
+    for key in {key for series_map in series_maps for key in series_map}:
+        parts = [series_map[key] for series_map in series_maps if key in series_map]
+        series[key] = ColumnSeries.concat(parts[0].data_class, parts)
+    return series
 
 
-def parse_data_series(data: list) -> TodaysData:
+def parse_data_series(series_maps: list[SeriesMap]) -> TodaysData:
     today = TodaysData()
 
-    grouped_by_type = group_by_type(data)
+    series = merge_series(series_maps)
 
-    today.cpu.extend(grouped_by_type.get("CpuData", []))
+    today.cpu = series.get(("CpuData", DEFAULT_SERIES_KEY), today.cpu)
+    today.gpu = series_of_type(series, "GpuData")
+    today.network = series_of_type(series, "NetworkData")
+    today.ups = series.get(("UpsData", DEFAULT_SERIES_KEY), today.ups)
+    today.logger = series.get(("LoggerData", DEFAULT_SERIES_KEY), today.logger)
+    today.collectors = series_of_type(series, "CollectorData")
 
-    gpu_data_by_key = group_by_key(grouped_by_type.get("GpuData", []), "uuid")
-    for key, value in gpu_data_by_key.items():
-        today.gpu.setdefault(key, []).extend(value)  # type: ignore
+    return today
 
-    network_data_by_key = group_by_key(
-        grouped_by_type.get("NetworkData", []), "destination"
-    )
-    for key, value in network_data_by_key.items():
-        today.network.setdefault(key, []).extend(value)  # type: ignore
 
-    today.ups.extend(grouped_by_type.get("UpsData", []))
+def load_columns(day: date) -> SeriesMap:
+    # memory mapped arrays go straight into the series without a copy
+    reader = ColumnStoreReader(COLUMN_DATA)
+    series = {}
+    for data_class in get_args(DataImpl):
+        type_name = data_class.__name__
+        for key in reader.list_keys(day, type_name):
+            columns = reader.read(day, type_name, key)
+            series[(type_name, key)] = ColumnSeries.from_columns(data_class, columns)
+    return series
 
-    return today
+
+def load_today_columns() -> TodaysData:
+    today = date.today()
+    return parse_data_series(
+        [load_columns(today - timedelta(days=1)), load_columns(today)]
+    )
 
 
-def load_today() -> TodaysData:
+@st.cache_data(max_entries=2)
+def load_past_day(day: date) -> TodaysData:
     logger = logging.getLogger("frontend")
-    global TODAY_DATA_CACHE
-    if did_yesterday_change():
-        logger.info("Yesterday's data changed, reloading today's data")
-        TODAY_DATA_CACHE = TodayCache()
-        load_yesterday.clear()
-    yesterdays_data, file_hash = load_yesterday()
-    todays_data = load_today_cache()
-
-    return parse_data_series(yesterdays_data + todays_data)
+    if STORAGE_ENGINE == "columns":
+        return parse_data_series([load_columns(day)])
+    data = [decode_data(data_dict) for data_dict in read_day(day)]
+    logger.debug(f"Loaded {len(data)} archived rows for {day}")
+    return parse_data_series([group_into_series(data)])
+
+
+class LiveTail:
+    """
+    One session's copy of the recent raw series of the plotted type. Each update asks
+    the query service only for the rows newer than the last one held, so a dashboard
+    left open all day moves a few rows per refresh instead of the whole window.
+    """
+
+    def __init__(self, time_range: float, type_name: str) -> None:
+        self.time_range = time_range
+        self.type_name = type_name
+        self.series: SeriesMap = {}
+
+    def update(self) -> TodaysData:
+        logger = logging.getLogger("frontend")
+        start_time = time.time() - self.time_range
+        try:
+            for key in series_keys(QUERY_CLIENT, self.type_name):
+                self.append((self.type_name, key), start_time)
+        except OSError as e:
+            logger.debug(f"Query service unavailable, reading files: {e}")
+            return load_today(self.time_range, self.type_name)
+        return parse_data_series(
+            [{key: series.window(start_time) for key, series in self.series.items()}]
+        )
+
+    def append(self, key: SeriesKey, start_time: float) -> None:
+        series = self.series.get(key)
+        if series is None:
+            self.series[key] = QUERY_CLIENT.series(SeriesQuery(*key, start=start_time))
+            return
+        since = start_time
+        if len(series) > 0:
+            # rows stamped before the newest one held, by another clock, are missed
+            since = max(start_time, float(series["timestamp"][-1]))
+        series.extend_columns(
+            QUERY_CLIENT.series(SeriesQuery(*key, start=since)).columns
+        )
+        stale = int(np.searchsorted(series["timestamp"], start_time, "right"))
+        if stale > len(series) // 4:
+            # the next append copies only the rows still inside the window
+            self.series[key] = series.window(start_time)
+
+
+def load_today(
+    time_range: float | None = None, type_name: str | None = None
+) -> TodaysData:
+    if STORAGE_ENGINE == "columns":
+        return load_today_columns()
+    start_time = None if time_range is None else time.time() - time_range
+    type_names = [type_name] if type_name is not None else list(DATA_CLASSES)
+    return parse_data_series([fetch_series(type_names, start=start_time)])
@@ -0,0 +1,62 @@
+import pandas as pd
+import streamlit as st
+from plotly import graph_objects, subplots
+from plotly.colors import sequential
+
+from app.dashboard.draw_utils import downsample_df, select_keys
+from app.dashboard.frame_cache import plot_frame
+from app.shared.column_series import ColumnSeries
+
+COLLECTOR_AGGREGATE_FIELDS = ["peak_duration_ms", "average_duration_ms"]
+
+
+def collector_aggregate_frame(data: ColumnSeries) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "timestamp": data["timestamp"],
+            "Peak duration (ms)": data["peak_duration_ms"],
+            "Average duration (ms)": data["average_duration_ms"],
+        }
+    )
+
+
+def draw_collector_aggregate_plot(
+    collector_agg_data: dict[str, ColumnSeries], time_range: float | None
+) -> None:
+    if len(collector_agg_data) == 0:
+        return
+
+    titles = ["Peak duration (ms)", "Average duration (ms)"]
+    figure = subplots.make_subplots(
+        rows=len(titles), cols=1, subplot_titles=titles, shared_xaxes=True
+    )
+    keys = sorted(collector_agg_data.keys())
+    selected = set(select_keys("Collectors", keys))
+
+    for index, key in enumerate(keys):
+        if key not in selected:
+            continue
+        line_color = sequential.Jet[(index * 8) % len(sequential.Jet)]
+        df = plot_frame(
+            "collector_aggregate",
+            key,
+            collector_agg_data[key],
+            time_range,
+            collector_aggregate_frame,
+        )
+        for row, title in enumerate(titles, start=1):
+            line_df = downsample_df(df, title)
+            figure.add_trace(
+                graph_objects.Scatter(
+                    x=line_df["time"],
+                    y=line_df[title],
+                    mode="lines",
+                    name=f"{key} {title}",
+                    line=dict(color=line_color),
+                ),
+                row=row,
+                col=1,
+            )
+    figure.update_layout(height=700)
+
+    st.plotly_chart(figure)
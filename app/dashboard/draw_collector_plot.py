@@ -0,0 +1,48 @@
+import pandas as pd
+import streamlit as st
+from plotly import graph_objects
+from plotly.colors import sequential
+
+from app.dashboard.draw_utils import downsample_df, select_keys
+from app.dashboard.frame_cache import plot_frame
+from app.shared.column_series import ColumnSeries
+
+
+def collector_frame(data: ColumnSeries) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "timestamp": data["timestamp"],
+            "Duration (ms)": data["duration_ms"],
+        }
+    )
+
+
+def draw_collector_plot(
+    collector_data: dict[str, ColumnSeries], time_range: float | None
+) -> None:
+    if len(collector_data) == 0:
+        return
+
+    figure = graph_objects.Figure()
+    keys = sorted(collector_data.keys())
+    selected = set(select_keys("Collectors", keys))
+
+    for index, key in enumerate(keys):
+        if key not in selected:
+            continue
+        df = plot_frame(
+            "collector", key, collector_data[key], time_range, collector_frame
+        )
+        duration_df = downsample_df(df, "Duration (ms)")
+        figure.add_trace(
+            graph_objects.Scatter(
+                x=duration_df["time"],
+                y=duration_df["Duration (ms)"],
+                mode="lines",
+                name=key,
+                line=dict(color=sequential.Jet[(index * 8) % len(sequential.Jet)]),
+            )
+        )
+    figure.update_layout(title="Slowest call per collector (ms)", height=500)
+
+    st.plotly_chart(figure)
@@ -2,29 +2,46 @@ import pandas as pd
 import streamlit as st
 from plotly import graph_objects, subplots
 
-from app.dashboard.draw_utils import format_df_time
-from app.shared import CpuAggregatedData
+from app.dashboard.draw_utils import downsample_df
+from app.dashboard.frame_cache import plot_frame
+from app.shared.aggregate_utils import DEFAULT_SERIES_KEY
+from app.shared.column_series import ColumnSeries
+
+# the columns cpu_aggregate_frame reads, so only these are loaded
+CPU_AGGREGATE_FIELDS = [
+    "average_utilization",
+    "average_memory_used",
+    "average_temperature",
+]
+
+
+def cpu_aggregate_frame(cpu_agg_data: ColumnSeries) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "timestamp": cpu_agg_data["timestamp"],
+            "Average CPU Utilization": cpu_agg_data["average_utilization"],
+            "Average Memory Usage": cpu_agg_data["average_memory_used"],
+            "Average CPU Temperature": cpu_agg_data["average_temperature"],
+        }
+    )
 
 
 def draw_cpu_aggregate_plot(
-    cpu_agg_data: list[CpuAggregatedData], time_range: float | None
+    cpu_agg_data: ColumnSeries, time_range: float | None
 ) -> None:
     if len(cpu_agg_data) == 0:
         return
 
-    df = pd.DataFrame(
-        [
-            {
-                "timestamp": data.timestamp,
-                "Average CPU Utilization": data.average_utilization,
-                "Average Memory Usage": data.average_memory_used,
-                "Average CPU Temperature": data.average_temperature,
-            }
-            for data in cpu_agg_data
-        ]
+    df = plot_frame(
+        "cpu_aggregate",
+        DEFAULT_SERIES_KEY,
+        cpu_agg_data,
+        time_range,
+        cpu_aggregate_frame,
     )
-    df = format_df_time(df, time_range)
-    df.sort_values(by="time", inplace=True)
+    utilization_df = downsample_df(df, "Average CPU Utilization")
+    memory_df = downsample_df(df, "Average Memory Usage")
+    temp_df = downsample_df(df, "Average CPU Temperature")
 
     figure = subplots.make_subplots(
         rows=3,
@@ -39,8 +56,8 @@ def draw_cpu_aggregate_plot(
 
     figure.add_trace(
         graph_objects.Scatter(
-            x=df["time"],
-            y=df["Average CPU Utilization"],
+            x=utilization_df["time"],
+            y=utilization_df["Average CPU Utilization"],
             name="Average CPU Utilization",
             mode="lines",
         ),
@@ -50,8 +67,8 @@ def draw_cpu_aggregate_plot(
 
     figure.add_trace(
         graph_objects.Scatter(
-            x=df["time"],
-            y=df["Average Memory Usage"],
+            x=memory_df["time"],
+            y=memory_df["Average Memory Usage"],
             name="Average Memory Usage",
             mode="lines",
         ),
@@ -61,8 +78,8 @@ def draw_cpu_aggregate_plot(
 
     figure.add_trace(
         graph_objects.Scatter(
-            x=df["time"],
-            y=df["Average CPU Temperature"],
+            x=temp_df["time"],
+            y=temp_df["Average CPU Temperature"],
             name="Average CPU Temperature",
             mode="lines",
         ),
@@ -2,31 +2,31 @@ import pandas as pd
 import streamlit as st
 from plotly import graph_objects, subplots
 
-from app.dashboard.draw_utils import format_df_time
-from app.shared import CpuData
+from app.dashboard.draw_utils import downsample_df
+from app.dashboard.frame_cache import plot_frame
+from app.shared.aggregate_utils import DEFAULT_SERIES_KEY
+from app.shared.column_series import ColumnSeries
 
 
-def draw_cpu_plot(cpu_data: list[CpuData], time_range: float) -> None:
-    if len(cpu_data) == 0:
-        return
-    df = pd.DataFrame(
-        [
-            {
-                "timestamp": data.timestamp,
-                r"CPU%": data.utilization,
-                "Memory used (MiB)": data.memory_used,
-                "Temperature (C)": data.temperature,
-            }
-            for data in cpu_data
-        ]
+def cpu_frame(cpu_data: ColumnSeries) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "timestamp": cpu_data["timestamp"],
+            r"CPU%": cpu_data["utilization"],
+            "Memory used (MiB)": cpu_data["memory_used"],
+            "Temperature (C)": cpu_data["temperature"],
+        }
     )
 
-    df = format_df_time(df, time_range)
-    df.sort_values(by="time", inplace=True)
 
-    cpu_df = df[["time", r"CPU%"]]
-    memory_df = df[["time", "Memory used (MiB)"]]
-    temp_df = df[["time", "Temperature (C)"]]
+def draw_cpu_plot(cpu_data: ColumnSeries, time_range: float | None) -> None:
+    if len(cpu_data) == 0:
+        return
+    df = plot_frame("cpu", DEFAULT_SERIES_KEY, cpu_data, time_range, cpu_frame)
+
+    cpu_df = downsample_df(df[["time", r"CPU%"]], r"CPU%")
+    memory_df = downsample_df(df[["time", "Memory used (MiB)"]], "Memory used (MiB)")
+    temp_df = downsample_df(df[["time", "Temperature (C)"]], "Temperature (C)")
 
     figure = subplots.make_subplots(
         rows=3,
@@ -3,12 +3,32 @@ import streamlit as st
 from plotly import graph_objects, subplots
 from plotly.colors import sequential
 
-from app.dashboard.draw_utils import format_df_time
-from app.shared import GpuAggregatedData
+from app.dashboard.draw_utils import downsample_df
+from app.dashboard.frame_cache import plot_frame
+from app.shared.column_series import ColumnSeries
+
+GPU_AGGREGATE_FIELDS = [
+    "average_utilization_gpu",
+    "average_memory_used",
+    "average_temperature_gpu",
+    "average_power_draw",
+]
+
+
+def gpu_aggregate_frame(gpu_data: ColumnSeries) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "timestamp": gpu_data["timestamp"],
+            "Average GPU Utilization": gpu_data["average_utilization_gpu"],
+            "Average Memory Usage": gpu_data["average_memory_used"],
+            "Average GPU Temperature": gpu_data["average_temperature_gpu"],
+            "Average Power Usage": gpu_data["average_power_draw"],
+        }
+    )
 
 
 def draw_gpu_aggregate_plot(
-    gpu_agg_data: dict[str, list[GpuAggregatedData]], time_range: float | None
+    gpu_agg_data: dict[str, ColumnSeries], time_range: float | None
 ) -> None:
     if len(gpu_agg_data) == 0:
         return
@@ -32,25 +52,16 @@ def draw_gpu_aggregate_plot(
         gpu_name = f"GPU-{gpu_index}"
         line_color = sequential.Plasma[(gpu_index * 8) % len(sequential.Plasma)]
 
-        df = pd.DataFrame(
-            [
-                {
-                    "timestamp": data.timestamp,
-                    "Average GPU Utilization": data.average_utilization_gpu,
-                    "Average Memory Usage": data.average_memory_used,
-                    "Average GPU Temperature": data.average_temperature_gpu,
-                    "Average Power Usage": data.average_power_draw,
-                }
-                for data in gpu_data
-            ]
-        )
-        df = format_df_time(df, time_range)
-        df.sort_values(by="time", inplace=True)
+        df = plot_frame("gpu_aggregate", key, gpu_data, time_range, gpu_aggregate_frame)
+        utilization_df = downsample_df(df, "Average GPU Utilization")
+        memory_df = downsample_df(df, "Average Memory Usage")
+        temp_df = downsample_df(df, "Average GPU Temperature")
+        power_df = downsample_df(df, "Average Power Usage")
 
         figure.add_trace(
             graph_objects.Scatter(
-                x=df["time"],
-                y=df["Average GPU Utilization"],
+                x=utilization_df["time"],
+                y=utilization_df["Average GPU Utilization"],
                 name=f"{gpu_name} Average GPU Utilization (%)",
                 mode="lines",
                 line=dict(color=line_color),
@@ -61,8 +72,8 @@ def draw_gpu_aggregate_plot(
 
         figure.add_trace(
             graph_objects.Scatter(
-                x=df["time"],
-                y=df["Average Memory Usage"],
+                x=memory_df["time"],
+                y=memory_df["Average Memory Usage"],
                 name=f"{gpu_name} Average Memory Usage (MiB)",
                 mode="lines",
                 line=dict(color=line_color),
@@ -73,8 +84,8 @@ def draw_gpu_aggregate_plot(
 
         figure.add_trace(
             graph_objects.Scatter(
-                x=df["time"],
-                y=df["Average GPU Temperature"],
+                x=temp_df["time"],
+                y=temp_df["Average GPU Temperature"],
                 name=f"{gpu_name} Average GPU Temperature (C)",
                 mode="lines",
                 line=dict(color=line_color),
@@ -85,8 +96,8 @@ def draw_gpu_aggregate_plot(
 
         figure.add_trace(
             graph_objects.Scatter(
-                x=df["time"],
-                y=df["Average Power Usage"],
+                x=power_df["time"],
+                y=power_df["Average Power Usage"],
                 name=f"{gpu_name} Average Power Usage (W)",
                 mode="lines",
                 line=dict(color=line_color),
@@ -3,11 +3,26 @@ import streamlit as st
 from plotly import graph_objects, subplots
 from plotly.colors import sequential
 
-from app.dashboard.draw_utils import format_df_time
-from app.shared import GpuData
+from app.dashboard.draw_utils import downsample_df
+from app.dashboard.frame_cache import plot_frame
+from app.shared.column_series import ColumnSeries
 
 
-def draw_gpu_plot(all_gpu_data: dict[str, list[GpuData]], time_range: float) -> None:
+def gpu_frame(gpu_data: ColumnSeries) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "timestamp": gpu_data["timestamp"],
+            r"GPU%": gpu_data["utilization_gpu"],
+            "Memory used (MiB)": gpu_data["memory_used"],
+            "Temperature (C)": gpu_data["temperature_gpu"],
+            "Power (W)": gpu_data["power_draw"],
+        }
+    )
+
+
+def draw_gpu_plot(
+    all_gpu_data: dict[str, ColumnSeries], time_range: float | None
+) -> None:
     if len(all_gpu_data) == 0:
         return
 
@@ -24,24 +39,15 @@ def draw_gpu_plot(all_gpu_data: dict[str, list[GpuData]], time_range: float) ->
         gpu_index = keys.index(key)
         gpu_name = f"GPU-{gpu_index}"
         line_color = sequential.Plasma[(gpu_index * 8) % len(sequential.Plasma)]
-        df = pd.DataFrame(
-            [
-                {
-                    "timestamp": data.timestamp,
-                    r"GPU%": data.utilization_gpu,
-                    "Memory used (MiB)": data.memory_used,
-                    "Temperature (C)": data.temperature_gpu,
-                    "Power (W)": data.power_draw,
-                }
-                for data in gpu_data
-            ]
-        )
-        df = format_df_time(df, time_range)
-        df.sort_values(by="time", inplace=True)
+        df = plot_frame("gpu", key, gpu_data, time_range, gpu_frame)
+        gpu_df = downsample_df(df, r"GPU%")
+        memory_df = downsample_df(df, "Memory used (MiB)")
+        temp_df = downsample_df(df, "Temperature (C)")
+        power_df = downsample_df(df, "Power (W)")
         figure.add_trace(
             graph_objects.Scatter(
-                x=df["time"],
-                y=df[r"GPU%"],
+                x=gpu_df["time"],
+                y=gpu_df[r"GPU%"],
                 mode="lines",
                 name=f"{gpu_name} %",
                 line=dict(color=line_color),
@@ -51,8 +57,8 @@ def draw_gpu_plot(all_gpu_data: dict[str, list[GpuData]], time_range: float) ->
         )
         figure.add_trace(
             graph_objects.Scatter(
-                x=df["time"],
-                y=df["Memory used (MiB)"],
+                x=memory_df["time"],
+                y=memory_df["Memory used (MiB)"],
                 mode="lines",
                 name=f"{gpu_name} Memory used (MiB)",
                 line=dict(color=line_color),
@@ -62,8 +68,8 @@ def draw_gpu_plot(all_gpu_data: dict[str, list[GpuData]], time_range: float) ->
         )
         figure.add_trace(
             graph_objects.Scatter(
-                x=df["time"],
-                y=df["Temperature (C)"],
+                x=temp_df["time"],
+                y=temp_df["Temperature (C)"],
                 mode="lines",
                 name=f"{gpu_name} Temperature (C)",
                 line=dict(color=line_color),
@@ -73,8 +79,8 @@ def draw_gpu_plot(all_gpu_data: dict[str, list[GpuData]], time_range: float) ->
         )
         figure.add_trace(
             graph_objects.Scatter(
-                x=df["time"],
-                y=df["Power (W)"],
+                x=power_df["time"],
+                y=power_df["Power (W)"],
                 mode="lines",
                 name=f"{gpu_name} Power (W)",
                 line=dict(color=line_color),
@@ -0,0 +1,78 @@
+import pandas as pd
+import streamlit as st
+from plotly import graph_objects, subplots
+
+from app.dashboard.draw_utils import downsample_df
+from app.dashboard.frame_cache import plot_frame
+from app.shared.aggregate_utils import DEFAULT_SERIES_KEY
+from app.shared.column_series import ColumnSeries
+
+LOGGER_AGGREGATE_COLUMNS = {
+    "queue_depth": "Queue depth",
+    "loop_lag_ms": "Event loop lag (ms)",
+    "write_latency_ms": "Write latency (ms)",
+    "collector_ms": "Slowest collector call (ms)",
+}
+LOGGER_AGGREGATE_FIELDS = [
+    f"{statistic}_{name}"
+    for name in LOGGER_AGGREGATE_COLUMNS
+    for statistic in ["peak", "average"]
+] + ["dropped_rows"]
+
+
+def logger_aggregate_frame(logger_agg_data: ColumnSeries) -> pd.DataFrame:
+    df = pd.DataFrame({"timestamp": logger_agg_data["timestamp"]})
+    for name, title in LOGGER_AGGREGATE_COLUMNS.items():
+        df[f"Peak {title}"] = logger_agg_data[f"peak_{name}"]
+        df[f"Average {title}"] = logger_agg_data[f"average_{name}"]
+    df["Dropped rows"] = logger_agg_data["dropped_rows"]
+    return df
+
+
+def draw_logger_aggregate_plot(
+    logger_agg_data: ColumnSeries, time_range: float | None
+) -> None:
+    if len(logger_agg_data) == 0:
+        return
+
+    df = plot_frame(
+        "logger_aggregate",
+        DEFAULT_SERIES_KEY,
+        logger_agg_data,
+        time_range,
+        logger_aggregate_frame,
+    )
+
+    figure = subplots.make_subplots(
+        rows=len(LOGGER_AGGREGATE_COLUMNS) + 1,
+        cols=1,
+        subplot_titles=list(LOGGER_AGGREGATE_COLUMNS.values()) + ["Dropped rows"],
+        shared_xaxes=True,
+    )
+    for row, title in enumerate(LOGGER_AGGREGATE_COLUMNS.values(), start=1):
+        for statistic in ["Peak", "Average"]:
+            line_df = downsample_df(df, f"{statistic} {title}")
+            figure.add_trace(
+                graph_objects.Scatter(
+                    x=line_df["time"],
+                    y=line_df[f"{statistic} {title}"],
+                    name=f"{statistic} {title}",
+                    mode="lines",
+                ),
+                row=row,
+                col=1,
+            )
+    dropped_df = downsample_df(df, "Dropped rows")
+    figure.add_trace(
+        graph_objects.Scatter(
+            x=dropped_df["time"],
+            y=dropped_df["Dropped rows"],
+            name="Dropped rows",
+            mode="lines",
+        ),
+        row=len(LOGGER_AGGREGATE_COLUMNS) + 1,
+        col=1,
+    )
+    figure.update_layout(height=900)
+
+    st.plotly_chart(figure)
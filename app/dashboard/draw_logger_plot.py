@@ -0,0 +1,57 @@
+import pandas as pd
+import streamlit as st
+from plotly import graph_objects, subplots
+
+from app.dashboard.draw_utils import downsample_df
+from app.dashboard.frame_cache import plot_frame
+from app.shared.aggregate_utils import DEFAULT_SERIES_KEY
+from app.shared.column_series import ColumnSeries
+
+LOGGER_COLUMNS = {
+    "queue_depth": "Queue depth",
+    "loop_lag_ms": "Event loop lag (ms)",
+    "rows_per_second": "Rows written per second",
+    "write_latency_ms": "Write latency (ms)",
+    "collector_ms": "Slowest collector call (ms)",
+    "dropped_rows": "Dropped rows",
+}
+COLLECTOR_TITLE = LOGGER_COLUMNS["collector_ms"]
+
+
+def logger_frame(logger_data: ColumnSeries) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "timestamp": logger_data["timestamp"],
+            **{title: logger_data[name] for name, title in LOGGER_COLUMNS.items()},
+            "Collector": logger_data["slowest_collector"],
+        }
+    )
+
+
+def draw_logger_plot(logger_data: ColumnSeries, time_range: float | None) -> None:
+    if len(logger_data) == 0:
+        return
+    df = plot_frame("logger", DEFAULT_SERIES_KEY, logger_data, time_range, logger_frame)
+
+    figure = subplots.make_subplots(
+        rows=len(LOGGER_COLUMNS),
+        cols=1,
+        subplot_titles=list(LOGGER_COLUMNS.values()),
+        shared_xaxes=True,
+    )
+    for row, title in enumerate(LOGGER_COLUMNS.values(), start=1):
+        plot_df = downsample_df(df[["time", title, "Collector"]], title)
+        figure.add_trace(
+            graph_objects.Scatter(
+                x=plot_df["time"],
+                y=plot_df[title],
+                mode="lines",
+                name=title,
+                text=plot_df["Collector"] if title == COLLECTOR_TITLE else None,
+            ),
+            row=row,
+            col=1,
+        )
+    figure.update_layout(height=900)
+
+    st.plotly_chart(figure)
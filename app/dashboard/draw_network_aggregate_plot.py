@@ -3,12 +3,27 @@ import streamlit as st
 from plotly import graph_objects, subplots
 from plotly.colors import sequential
 
-from app.dashboard.draw_utils import format_df_time
-from app.shared.network_data import NetworkAggregatedData
+from app.dashboard.draw_utils import downsample_df, select_keys
+from app.dashboard.frame_cache import plot_frame
+from app.shared.column_series import ColumnSeries
+
+NETWORK_AGGREGATE_FIELDS = ["num_pings", "num_hits", "percent_packet_loss", "peak_ping"]
+
+
+def network_aggregate_frame(net_data: ColumnSeries) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "timestamp": net_data["timestamp"],
+            "Num misses": net_data["num_pings"] - net_data["num_hits"],
+            "Num pings": net_data["num_pings"],
+            "Percent packet loss": net_data["percent_packet_loss"],
+            "Ping (ms)": net_data["peak_ping"],
+        }
+    )
 
 
 def draw_network_aggregate_plot(
-    net_agg_data: dict[str, list[NetworkAggregatedData]], time_range: float | None
+    net_agg_data: dict[str, ColumnSeries], time_range: float | None
 ) -> None:
     if len(net_agg_data) == 0:
         return
@@ -24,27 +39,21 @@ def draw_network_aggregate_plot(
     )
 
     keys = sorted(list(net_agg_data.keys()))
+    selected = set(select_keys("Destinations", keys))
 
-    for key, net_data in net_agg_data.items():
-        net_index = keys.index(key)
+    for net_index, key in enumerate(keys):
+        if key not in selected:
+            continue
+        net_data = net_agg_data[key]
         line_color = sequential.Jet[(net_index * 8) % len(sequential.Jet)]
 
-        df = pd.DataFrame(
-            [
-                {
-                    "timestamp": data.timestamp,
-                    "Num misses": data.num_pings - data.num_hits,
-                    "Num pings": data.num_pings,
-                    "Percent packet loss": data.percent_packet_loss,
-                    "Ping (ms)": data.peak_ping,
-                }
-                for data in net_data
-            ]
+        df = plot_frame(
+            "network_aggregate", key, net_data, time_range, network_aggregate_frame
         )
-        df = format_df_time(df, time_range)
-        df.sort_values(by="time", inplace=True)
 
-        text = df.apply(
+        ping_df = downsample_df(df, "Ping (ms)")
+        misses_df = downsample_df(df, "Num misses")
+        text = misses_df.apply(
             lambda x: f"Num pings: {x['Num pings']}. "
             f"Num misses: {x['Num misses']}. "
             f"Percent packet loss: {x['Percent packet loss']:.6f}%",
@@ -53,8 +62,8 @@ def draw_network_aggregate_plot(
 
         figure.add_trace(
             graph_objects.Scatter(
-                x=df["time"],
-                y=df["Ping (ms)"],
+                x=ping_df["time"],
+                y=ping_df["Ping (ms)"],
                 name=f"{key} Peak Ping (ms)",
                 mode="lines",
                 line=dict(color=line_color),
@@ -65,8 +74,8 @@ def draw_network_aggregate_plot(
 
         figure.add_trace(
             graph_objects.Scatter(
-                x=df["time"],
-                y=df["Num misses"],
+                x=misses_df["time"],
+                y=misses_df["Num misses"],
                 name=f"{key} Num misses",
                 mode="lines",
                 text=text,
@@ -3,12 +3,22 @@ import streamlit as st
 from plotly import graph_objects, subplots
 from plotly.colors import sequential
 
-from app.dashboard.draw_utils import format_df_time
-from app.shared import NetworkData
+from app.dashboard.draw_utils import downsample_df, select_keys, thin_df
+from app.dashboard.frame_cache import plot_frame
+from app.shared.column_series import ColumnSeries
+
+
+def network_frame(data: ColumnSeries) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "timestamp": data["timestamp"],
+            "Ping (ms)": data["ping_ms"],
+        }
+    )
 
 
 def draw_network_plot(
-    network_data: dict[str, list[NetworkData]], time_range: float
+    network_data: dict[str, ColumnSeries], time_range: float | None
 ) -> None:
     if len(network_data) == 0:
         return
@@ -20,26 +30,20 @@ def draw_network_plot(
         shared_xaxes=True,
     )
     keys = sorted(list(network_data.keys()))
+    selected = set(select_keys("Destinations", keys))
 
-    for key, data in network_data.items():
-        net_index = keys.index(key)
+    for net_index, key in enumerate(keys):
+        if key not in selected:
+            continue
+        data = network_data[key]
         line_color = sequential.Jet[(net_index * 8) % len(sequential.Jet)]
 
-        df = pd.DataFrame(
-            [
-                {
-                    "timestamp": data.timestamp,
-                    "Ping (ms)": data.ping_ms,
-                }
-                for data in data
-            ]
-        )
-        df = format_df_time(df, time_range)
-        df.sort_values(by="time", inplace=True)
+        df = plot_frame("network", key, data, time_range, network_frame)
+        ping_df = downsample_df(df, "Ping (ms)")
         figure.add_trace(
             graph_objects.Scatter(
-                x=df["time"],
-                y=df["Ping (ms)"],
+                x=ping_df["time"],
+                y=ping_df["Ping (ms)"],
                 mode="lines",
                 name=f"{key} Ping (ms)",
                 line=dict(color=line_color),
@@ -47,7 +51,7 @@ def draw_network_plot(
             row=1,
             col=1,
         )
-        nan_df = df[df["Ping (ms)"].isna()]
+        nan_df = thin_df(df[df["Ping (ms)"].isna()])
         nan_df["Ping (ms)"] = key
         figure.add_trace(
             graph_objects.Scatter(
@@ -2,12 +2,31 @@ import pandas as pd
 import streamlit as st
 from plotly import graph_objects, subplots
 
-from app.dashboard.draw_utils import format_df_time
-from app.shared.ups_data import UpsAggregatedData
+from app.dashboard.draw_utils import downsample_df
+from app.dashboard.frame_cache import plot_frame
+from app.shared.aggregate_utils import DEFAULT_SERIES_KEY
+from app.shared.column_series import ColumnSeries
+
+UPS_AGGREGATE_FIELDS = [
+    "up_percentage",
+    "average_output_current",
+    "average_output_voltage",
+]
+
+
+def ups_aggregate_frame(ups_agg_data: ColumnSeries) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "timestamp": ups_agg_data["timestamp"],
+            "Up percentage": ups_agg_data["up_percentage"],
+            "Average Power": ups_agg_data["average_output_current"]
+            * ups_agg_data["average_output_voltage"],
+        }
+    )
 
 
 def draw_ups_aggregate_plot(
-    ups_agg_data: list[UpsAggregatedData], time_range: float | None
+    ups_agg_data: ColumnSeries, time_range: float | None
 ) -> None:
     if len(ups_agg_data) == 0:
         return
@@ -22,24 +41,20 @@ def draw_ups_aggregate_plot(
         shared_xaxes=True,
     )
 
-    df = pd.DataFrame(
-        [
-            {
-                "timestamp": data.timestamp,
-                "Up percentage": data.up_percentage,
-                "Average Power": data.average_output_current
-                * data.average_output_voltage,
-            }
-            for data in ups_agg_data
-        ]
+    df = plot_frame(
+        "ups_aggregate",
+        DEFAULT_SERIES_KEY,
+        ups_agg_data,
+        time_range,
+        ups_aggregate_frame,
     )
-    df = format_df_time(df, time_range)
-    df.sort_values(by="time", inplace=True)
+    up_df = downsample_df(df, "Up percentage")
+    power_df = downsample_df(df, "Average Power")
 
     figure.add_trace(
         graph_objects.Scatter(
-            x=df["time"],
-            y=df["Up percentage"],
+            x=up_df["time"],
+            y=up_df["Up percentage"],
             mode="lines",
             name="Up percentage (%)",
         ),
@@ -49,8 +64,8 @@ def draw_ups_aggregate_plot(
 
     figure.add_trace(
         graph_objects.Scatter(
-            x=df["time"],
-            y=df["Average Power"],
+            x=power_df["time"],
+            y=power_df["Average Power"],
             mode="lines",
             name="Average Power (W)",
         ),
@@ -2,8 +2,21 @@ import pandas as pd
 import streamlit as st
 from plotly import graph_objects, subplots
 
-from app.dashboard.draw_utils import format_df_time
-from app.shared import UpsData
+from app.dashboard.draw_utils import downsample_df
+from app.dashboard.frame_cache import plot_frame
+from app.shared.aggregate_utils import DEFAULT_SERIES_KEY
+from app.shared.column_series import ColumnSeries
+
+
+def ups_frame(all_ups_data: ColumnSeries) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "timestamp": all_ups_data["timestamp"],
+            "Status": all_ups_data["status"],
+            "Power (W)": all_ups_data["output_current"]
+            * all_ups_data["output_voltage"],
+        }
+    )
 
 
 def find_status_transitions(df: pd.DataFrame) -> list[tuple[float, str]]:
@@ -14,7 +27,7 @@ def find_status_transitions(df: pd.DataFrame) -> list[tuple[float, str]]:
     return list(zip(transitions["time"], transitions["Status"]))
 
 
-def draw_ups_plot(all_ups_data: list[UpsData], time_range: float) -> None:
+def draw_ups_plot(all_ups_data: ColumnSeries, time_range: float | None) -> None:
     if len(all_ups_data) == 0:
         return
 
@@ -25,24 +38,14 @@ def draw_ups_plot(all_ups_data: list[UpsData], time_range: float) -> None:
         shared_xaxes=True,
     )
 
-    df = pd.DataFrame(
-        [
-            {
-                "timestamp": data.timestamp,
-                "Status": data.status,
-                "Power (W)": data.output_current * data.output_voltage,
-            }
-            for data in all_ups_data
-        ]
-    )
-    df = format_df_time(df, time_range)
+    df = plot_frame("ups", DEFAULT_SERIES_KEY, all_ups_data, time_range, ups_frame)
     if df.empty:
         return
-    df.sort_values(by="time", inplace=True)
 
     transitions = find_status_transitions(df)
     transitions.append((df["time"].max(), df["Status"].iloc[-1]))
     unique_statuses = [status for status in df["Status"].unique()]
+    power_df = downsample_df(df, "Power (W)")
 
     figure.add_trace(
         graph_objects.Scatter(
@@ -61,8 +64,8 @@ def draw_ups_plot(all_ups_data: list[UpsData], time_range: float) -> None:
 
     figure.add_trace(
         graph_objects.Scatter(
-            x=df["time"],
-            y=df["Power (W)"],
+            x=power_df["time"],
+            y=power_df["Power (W)"],
             mode="lines",
             name="Power (W)",
         ),
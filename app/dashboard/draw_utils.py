@@ -1,9 +1,15 @@
 import time
 
 import pandas as pd
+import streamlit as st
+
+from app.shared.downsample import downsample_indices
 
 pd.options.mode.copy_on_write = True
 
+PLOT_WIDTH = 1600  # in pixels, the widest a plot is expected to be rendered
+MAX_DEFAULT_KEYS = 8  # series drawn before the user picks any
+
 
 def format_df_time(df: pd.DataFrame, time_range: float | None = None) -> pd.DataFrame:
     if time_range is not None:
@@ -13,3 +19,33 @@ def format_df_time(df: pd.DataFrame, time_range: float | None = None) -> pd.Data
     df["time"] = dates
     df.drop(columns=["timestamp"], inplace=True)
     return df
+
+
+def downsample_df(
+    df: pd.DataFrame, y_column: str, width: int = PLOT_WIDTH
+) -> pd.DataFrame:
+    """
+    Bounds the number of rows drawn for y_column against a time sorted "time" column.
+    Keeps the lowest and highest value of each pixel, so peaks survive.
+    """
+    max_points = 2 * width
+    if len(df) <= max_points:
+        return df
+    y = df[y_column].to_numpy(dtype=float)
+    return df.iloc[downsample_indices(y, max_points)]
+
+
+def thin_df(df: pd.DataFrame, width: int = PLOT_WIDTH) -> pd.DataFrame:
+    """Evenly strides rows that are drawn as markers, where every row looks alike."""
+    step = len(df) // (2 * width) + 1
+    return df.iloc[::step]
+
+
+def select_keys(label: str, keys: list[str]) -> list[str]:
+    """Lets the user pick which of many series to draw, defaulting to the first few."""
+    if len(keys) <= MAX_DEFAULT_KEYS:
+        return keys
+    # drawn above the plot rather than in the sidebar, so it works inside fragments
+    return st.multiselect(
+        label, keys, default=keys[:MAX_DEFAULT_KEYS], key=f"select_keys_{label}"
+    )
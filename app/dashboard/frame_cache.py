@@ -0,0 +1,98 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+import pandas as pd
+
+from app.dashboard.draw_utils import format_df_time
+from app.shared.column_series import ColumnSeries
+
+FRAME_CACHE_BYTES = 256 * 1024**2  # memory cap for cached plot frames
+TIME_BUCKETS = 200  # a window start is rounded to 1/200th of its range
+
+FrameKey = tuple[Hashable, ...]
+
+
+class FrameCache:
+    """
+    Least recently used plot frames, shared by every session and bounded by the
+    memory their columns take up. Frames are returned as shallow copies, so callers
+    adding columns never alter the cached frame.
+    """
+
+    def __init__(self, max_bytes: int = FRAME_CACHE_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self.frames: OrderedDict[FrameKey, tuple[pd.DataFrame, int]] = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key: FrameKey) -> pd.DataFrame | None:
+        with self.lock:
+            entry = self.frames.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.frames.move_to_end(key)
+            return entry[0].copy(deep=False)
+
+    def put(self, key: FrameKey, frame: pd.DataFrame) -> pd.DataFrame:
+        size = int(frame.memory_usage(index=True, deep=False).sum())
+        with self.lock:
+            if key in self.frames:
+                self.size -= self.frames.pop(key)[1]
+            if size <= self.max_bytes:
+                self.frames[key] = (frame, size)
+                self.size += size
+            while self.size > self.max_bytes:
+                _, (_, evicted_size) = self.frames.popitem(last=False)
+                self.size -= evicted_size
+        return frame.copy(deep=False)
+
+
+FRAME_CACHE = FrameCache()
+
+
+def time_bucket(time_range: float | None) -> tuple[float, float] | None:
+    # sliding the window by less than one bucket reuses the same frame
+    if time_range is None:
+        return None
+    width = max(time_range / TIME_BUCKETS, 1.0)
+    start = math.floor((time.time() - time_range) / width) * width
+    return time_range, start
+
+
+def series_version(series: ColumnSeries) -> tuple[int, float, float]:
+    # series only ever grow at the end or get replaced after a rotation
+    if len(series) == 0:
+        return 0, 0.0, 0.0
+    timestamps = series["timestamp"]
+    return len(series), float(timestamps[0]), float(timestamps[-1])
+
+
+def plot_frame(
+    plot: str,
+    key: str,
+    series: ColumnSeries,
+    time_range: float | None,
+    build: Callable[[ColumnSeries], pd.DataFrame],
+) -> pd.DataFrame:
+    """
+    Returns build(series) with a timezone aware "time" column in place of
+    "timestamp", limited to time_range and sorted by time, from the cache if the
+    same plot of the same data and time window was built before.
+    """
+    bucket = time_bucket(time_range)
+    cache_key = (plot, key, series_version(series), bucket)
+    frame = FRAME_CACHE.get(cache_key)
+    if frame is not None:
+        return frame
+    if bucket is not None:
+        series = series.window(bucket[1])
+    # series are kept sorted by timestamp, so the frame needs no sort
+    frame = format_df_time(build(series))
+    return FRAME_CACHE.put(cache_key, frame)
@@ -0,0 +1,224 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import BinaryIO, Callable
+
+from app.shared.column_store import ColumnStoreWriter
+from app.shared.data_interface import DataInterface
+from app.shared.segments import rotate_file
+from app.shared.time_index import TimeIndexWriter
+
+
+class FsyncPolicy(Enum):
+    NEVER = "never"
+    EVERY_BATCH = "every_batch"
+    INTERVAL = "interval"
+
+
+@dataclass
+class BatchWriterConfig:
+    max_batch_size: int = 512  # rows
+    flush_interval: float = 0.5  # in seconds
+    fsync_policy: FsyncPolicy = FsyncPolicy.INTERVAL
+    fsync_interval: float = 30.0  # in seconds
+    stats_interval: float = 300.0  # in seconds
+    index_interval: float = 60.0  # in seconds between time index entries
+
+
+@dataclass
+class WriterStats:
+    batches_written: int = 0
+    rows_written: int = 0
+    bytes_written: int = 0
+    fsyncs: int = 0
+    last_batch_size: int = 0
+    peak_batch_size: int = 0
+    last_write_latency: float = 0.0  # in seconds
+    peak_write_latency: float = 0.0  # in seconds
+    total_write_latency: float = 0.0  # in seconds
+    started: float = field(default_factory=time.monotonic)
+
+    @property
+    def average_batch_size(self) -> float:
+        if self.batches_written == 0:
+            return 0.0
+        return self.rows_written / self.batches_written
+
+    @property
+    def average_write_latency(self) -> float:
+        if self.batches_written == 0:
+            return 0.0
+        return self.total_write_latency / self.batches_written
+
+    def record(self, batch_size: int, num_bytes: int, latency: float) -> None:
+        self.batches_written += 1
+        self.rows_written += batch_size
+        self.bytes_written += num_bytes
+        self.last_batch_size = batch_size
+        self.peak_batch_size = max(self.peak_batch_size, batch_size)
+        self.last_write_latency = latency
+        self.peak_write_latency = max(self.peak_write_latency, latency)
+        self.total_write_latency += latency
+
+    def summary(self) -> str:
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        return (
+            f"{self.rows_written} rows in {self.batches_written} batches "
+            f"({self.rows_written / elapsed:.1f} rows/s). "
+            f"Batch size avg: {self.average_batch_size:.1f}, "
+            f"peak: {self.peak_batch_size}. "
+            f"Write latency avg: {self.average_write_latency * 1000:.3f} ms, "
+            f"peak: {self.peak_write_latency * 1000:.3f} ms. "
+            f"Fsyncs: {self.fsyncs}"
+        )
+
+
+class BatchWriter:
+    def __init__(
+        self,
+        data_path: str,
+        config: BatchWriterConfig | None = None,
+        column_store: ColumnStoreWriter | None = None,
+        on_rotated: Callable[[list[DataInterface]], None] | None = None,
+    ) -> None:
+        self.data_path = data_path
+        # called with the rows bound for the new file when someone else rotated it
+        self.on_rotated = on_rotated
+        self.config = config if config is not None else BatchWriterConfig()
+        self.column_store = column_store
+        self.time_index = TimeIndexWriter(data_path, self.config.index_interval)
+        self.stats = WriterStats()
+        self.file: BinaryIO | None = None
+        self.pending: list[DataInterface] = []
+        self.lock = asyncio.Lock()
+        self.last_fsync = time.monotonic()
+        self.last_stats_log = time.monotonic()
+        self.logger = logging.getLogger("data_logger")
+
+    def open(self) -> None:
+        if self.file is None:
+            self.file = open(self.data_path, mode="ab")
+
+    def close(self) -> None:
+        self.close_file()
+        if self.column_store is not None:
+            self.column_store.close()
+
+    def close_file(self) -> None:
+        if self.file is None:
+            return
+        self.file.flush()
+        if self.config.fsync_policy != FsyncPolicy.NEVER:
+            os.fsync(self.file.fileno())
+        self.file.close()
+        self.file = None
+        self.time_index.close()
+
+    def was_rotated(self) -> bool:
+        # the path points at a different file once someone else renamed it away
+        if self.file is None:
+            return False
+        try:
+            current = os.stat(self.data_path)
+        except FileNotFoundError:
+            return True
+        return current.st_ino != os.fstat(self.file.fileno()).st_ino
+
+    async def rotate(self, destination: str) -> None:
+        """
+        Renames the day file into destination and starts a fresh one. Nothing is copied,
+        and rows still pending are written to the old file before it is renamed.
+        """
+        await self.flush()
+        async with self.lock:
+            await asyncio.to_thread(self.close_file)
+            rotate_file(self.data_path, destination)
+            self.time_index.reset()
+            self.open()
+        self.logger.info(f"Rotated {self.data_path} to {destination}")
+
+    def __enter__(self) -> "BatchWriter":
+        self.open()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    async def run(self, queue: asyncio.Queue[DataInterface]) -> None:
+        self.open()
+        try:
+            while True:
+                await self.collect_batch(queue)
+                await self.flush()
+        finally:
+            # don't lose rows that were already taken off the queue
+            await self.flush()
+
+    async def collect_batch(self, queue: asyncio.Queue[DataInterface]) -> None:
+        self.pending.append(await queue.get())
+        deadline = time.monotonic() + self.config.flush_interval
+        while len(self.pending) < self.config.max_batch_size:
+            if not queue.empty():
+                self.pending.append(queue.get_nowait())
+                continue
+            remaining = deadline - time.monotonic()
+            if remaining <= 0.0:
+                break
+            try:
+                self.pending.append(await asyncio.wait_for(queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+    async def flush(self) -> None:
+        """
+        Writes the pending rows in a worker thread, so that collectors keep queueing
+        while the disk is slow. The lock keeps a rotation out of a write in progress.
+        """
+        if len(self.pending) == 0:
+            return
+        async with self.lock:
+            if self.was_rotated():
+                self.logger.info(f"{self.data_path} was rotated, reopening")
+                self.close_file()
+                self.time_index.reset()
+                if self.on_rotated is not None:
+                    self.on_rotated(self.pending)
+            self.open()
+            batch = self.pending
+            self.pending = []
+            encoded = "".join(
+                json.dumps(row.to_dict()) + "\n" for row in batch
+            ).encode()
+
+            start = time.perf_counter()
+            await asyncio.to_thread(self.write_batch, batch, encoded)
+            latency = time.perf_counter() - start
+
+        self.stats.record(len(batch), len(encoded), latency)
+        if time.monotonic() - self.last_stats_log > self.config.stats_interval:
+            self.last_stats_log = time.monotonic()
+            self.logger.debug(f"Writer stats: {self.stats.summary()}")
+
+    def write_batch(self, batch: list[DataInterface], encoded: bytes) -> None:
+        assert self.file is not None
+        offset = os.fstat(self.file.fileno()).st_size
+        self.file.write(encoded)
+        self.file.flush()
+        self.time_index.record(time.time(), offset)
+        if self.column_store is not None:
+            self.column_store.append(batch)  # type: ignore
+        if self.should_fsync():
+            os.fsync(self.file.fileno())
+            self.last_fsync = time.monotonic()
+            self.stats.fsyncs += 1
+
+    def should_fsync(self) -> bool:
+        if self.config.fsync_policy == FsyncPolicy.EVERY_BATCH:
+            return True
+        if self.config.fsync_policy == FsyncPolicy.INTERVAL:
+            return time.monotonic() - self.last_fsync >= self.config.fsync_interval
+        return False
@@ -0,0 +1,63 @@
+import asyncio
+import json
+import logging
+import os
+from enum import Enum
+
+from app.shared.data_interface import DataInterface
+
+
+class OverflowPolicy(Enum):
+    BLOCK = "block"  # producers wait for the writer, collectors fall behind
+    DROP_OLDEST = "drop_oldest"  # keep the most recent samples
+    DROP_NEWEST = "drop_newest"  # keep the backlog, discard incoming samples
+
+
+class BoundedDataQueue(asyncio.Queue):
+    """
+    Fixed capacity ring of samples between the collectors and the writer. It absorbs
+    bursts while the disk stalls, and once full applies the overflow policy instead
+    of growing until the process runs out of memory. Drops are counted per type.
+    """
+
+    def __init__(self, maxsize: int, policy: OverflowPolicy) -> None:
+        super().__init__(maxsize)
+        self.policy = policy
+        self.drops: dict[str, int] = {}  # cumulative, across restarts when persisted
+        self.warned: set[str] = set()
+        self.logger = logging.getLogger("data_logger")
+
+    @property
+    def total_drops(self) -> int:
+        return sum(self.drops.values())
+
+    def count_drop(self, row: DataInterface) -> None:
+        type_name = row.__class__.__name__
+        if type_name not in self.warned:
+            self.warned.add(type_name)
+            self.logger.warning(f"Data queue full, dropping {type_name} rows")
+        self.drops[type_name] = self.drops.get(type_name, 0) + 1
+
+    async def put(self, item: DataInterface) -> None:
+        if self.policy == OverflowPolicy.BLOCK or not self.full():
+            await super().put(item)
+        elif self.policy == OverflowPolicy.DROP_OLDEST:
+            self.count_drop(self.get_nowait())
+            self.put_nowait(item)
+        else:
+            self.count_drop(item)
+
+    def save_drops(self, path: str) -> None:
+        temp_path = path + ".tmp"
+        with open(temp_path, "w") as file:
+            json.dump(self.drops, file)
+        os.replace(temp_path, path)
+
+    def load_drops(self, path: str) -> None:
+        if not os.path.isfile(path):
+            return
+        try:
+            with open(path) as file:
+                self.drops = json.load(file)
+        except (OSError, json.JSONDecodeError) as e:
+            self.logger.error(f"Failed to load {path}: {e}")
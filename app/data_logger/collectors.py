@@ -0,0 +1,136 @@
+import importlib
+import os
+import shutil
+from dataclasses import dataclass, replace
+from enum import Enum
+from typing import Awaitable, Callable, Protocol, runtime_checkable
+
+from app.data_logger.logger_config import LoggerConfig
+from app.shared import CpuData, GpuData, NetworkData, UpsData
+from app.shared.aggregate_utils import DATA_CLASSES
+from app.shared.data_interface import DataInterface
+
+CollectorResult = DataInterface | list[DataInterface] | None
+PutData = Callable[[DataInterface], Awaitable[None]]
+
+
+@runtime_checkable
+class StreamingCollector(Protocol):
+    """A source that schedules its own sampling and hands rows to put."""
+
+    async def run(self, put: PutData) -> None: ...
+
+
+# a polled collector is a blocking callable, run in a worker thread every interval
+PolledCollector = Callable[[], CollectorResult]
+Collector = PolledCollector | StreamingCollector
+
+
+class StartupCost(Enum):
+    CHEAP = "cheap"  # constructed on the event loop
+    EXPENSIVE = "expensive"  # constructed in a worker thread, e.g. spawns processes
+
+
+@dataclass
+class CollectorSpec:
+    name: str
+    data_type: type
+    factory: Callable[["CollectorSpec", LoggerConfig], Collector]
+    interval: float = 1.0  # in seconds, ignored by streaming collectors
+    timeout: float = 5.0  # in seconds per polled call
+    startup_cost: StartupCost = StartupCost.CHEAP
+    available: Callable[[], bool] = lambda: True  # checked before construction
+
+
+COLLECTORS: dict[str, CollectorSpec] = {}
+
+
+def register_collector(spec: CollectorSpec) -> CollectorSpec:
+    if spec.name in COLLECTORS:
+        raise ValueError(f"Collector already registered: {spec.name}")
+    if spec.data_type.__name__ not in DATA_CLASSES:
+        # aggregates, series keys and decoding all look the type up by name
+        raise ValueError(
+            f"Collector {spec.name} emits {spec.data_type.__name__}, which is not one "
+            f"of the data types in app.shared.types.DataImpl"
+        )
+    COLLECTORS[spec.name] = spec
+    return spec
+
+
+def enabled_collectors(config: LoggerConfig) -> list[CollectorSpec]:
+    """
+    Imports any plugin modules named in config, which register their collectors on
+    import, then applies the per-collector overrides from config.
+    """
+    for module in config.collector_modules:
+        importlib.import_module(module)
+    specs = []
+    for name, spec in COLLECTORS.items():
+        override = config.collectors.get(name)
+        if override is None:
+            specs.append(spec)
+            continue
+        if not override.enabled:
+            continue
+        specs.append(
+            replace(
+                spec,
+                interval=override.interval or spec.interval,
+                timeout=override.timeout or spec.timeout,
+            )
+        )
+    unknown = set(config.collectors) - set(COLLECTORS)
+    if unknown:
+        raise ValueError(f"Unknown collectors in config: {sorted(unknown)}")
+    return specs
+
+
+# the tool modules are only imported once their collector is actually constructed
+
+
+def cpu_collector(spec: CollectorSpec, config: LoggerConfig) -> Collector:
+    from app.data_logger.tools.cpu_usage import cpu_usage
+
+    return cpu_usage
+
+
+def gpu_collector(spec: CollectorSpec, config: LoggerConfig) -> Collector:
+    from app.data_logger.tools.nvidia_smi import NvidiaSmiManager
+
+    return NvidiaSmiManager(poll_interval=spec.interval).get_data
+
+
+def network_collector(spec: CollectorSpec, config: LoggerConfig) -> Collector:
+    from app.data_logger.tools.network_health import MultiDestinationHealth
+
+    return MultiDestinationHealth(config.ping_targets, config.max_pings_in_flight)
+
+
+def ups_collector(spec: CollectorSpec, config: LoggerConfig) -> Collector:
+    from app.data_logger.tools.ups_stats import ups_stats
+
+    return ups_stats
+
+
+register_collector(CollectorSpec("cpu", CpuData, cpu_collector))
+register_collector(
+    CollectorSpec(
+        "gpu",
+        GpuData,
+        gpu_collector,
+        startup_cost=StartupCost.EXPENSIVE,
+        available=lambda: shutil.which("nvidia-smi") is not None,
+    )
+)
+register_collector(CollectorSpec("network", NetworkData, network_collector))
+register_collector(
+    CollectorSpec(
+        "ups",
+        UpsData,
+        ups_collector,
+        interval=60.0,
+        timeout=30.0,
+        available=lambda: os.path.isfile("/etc/apcupsd/apcupsd.conf"),
+    )
+)
@@ -1,17 +1,40 @@
 import asyncio
 import logging
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 
 from app.data_logger.bulk_stats_logger import BulkStatsLogger
+from app.data_logger.logger_config import load_logger_config
 from app.data_logger.today_logger import TodayLogger
-from app.shared.constants import BULK_DATA, TODAYS_DATA
+from app.query_service.hot_data import HotData
+from app.query_service.query_server import start_query_service
+from app.shared.aggregate_store import bulk_store
+from app.shared.constants import (
+    AGGREGATE_CHECKPOINT,
+    BULK_DATA,
+    COLUMN_DATA,
+    DROP_COUNTS,
+    LOGGER_CONFIG,
+    ROLLUP_CHECKPOINT,
+    STORAGE_ENGINE,
+    TODAYS_DATA,
+)
 from app.shared.initialize_logs import initialize_logs
+from app.shared.segment_archive import apply_retention, archive_segments
+from app.shared.segments import segment_path
 
 
-async def bulk_task(data_path: str, bulk_path: str, roll_over_time: timedelta) -> None:
+async def bulk_task(
+    today_logger: TodayLogger, bulk_path: str, roll_over_time: timedelta
+) -> None:
     logger = logging.getLogger("data_logger")
     logger.info("Starting bulk task")
-    bulk_stats_logger = BulkStatsLogger(data_path, bulk_path)
+    bulk_stats_logger = BulkStatsLogger(today_logger.data_path, bulk_path, bulk_store())
+    aggregator = today_logger.aggregator
+    if aggregator.day < date.today():
+        # the logger was down at the last roll over, don't fold that day into today
+        bulk_data = aggregator.flush()
+        bulk_stats_logger.write_data(bulk_data)
+        logger.info(f"Wrote {len(bulk_data)} stale checkpointed records to bulk data.")
     while True:
         now = datetime.now()
         next_roll_over = (
@@ -23,13 +46,14 @@ async def bulk_task(data_path: str, bulk_path: str, roll_over_time: timedelta) -
         )
         await asyncio.sleep(sleep_time)
 
-        bulk_stats_logger.make_backup()
-        logger.debug("Made backup of data.")
-        data = bulk_stats_logger.read_data()
-        logger.debug(f"Read {len(data)} records from data.")
-        bulk_data = bulk_stats_logger.bulk(data)
+        bulk_data = aggregator.flush()
         bulk_stats_logger.write_data(bulk_data)
-        bulk_stats_logger.clear_data()
+        if today_logger.checkpoint_path is not None:
+            aggregator.checkpoint(today_logger.checkpoint_path)
+        await today_logger.writer.rotate(segment_path(date.today() - timedelta(days=1)))
+        # compressing a day of samples takes a while, keep polling meanwhile
+        await asyncio.to_thread(archive_segments)
+        await asyncio.to_thread(apply_retention, date.today())
         logger.info(f"Wrote {len(bulk_data)} records to bulk data.")
 
 
@@ -39,15 +63,30 @@ async def async_main() -> None:
     logger.info("Starting data logger")
 
     data_path = TODAYS_DATA
-    today_logger = TodayLogger(data_path)
+    column_path = COLUMN_DATA if STORAGE_ENGINE == "columns" else None
+    config = load_logger_config(LOGGER_CONFIG)
+    today_logger = TodayLogger(
+        data_path,
+        column_path=column_path,
+        checkpoint_path=AGGREGATE_CHECKPOINT,
+        rollup_checkpoint_path=ROLLUP_CHECKPOINT,
+        config=config,
+        writer_config=config.writer,
+        drop_counts_path=DROP_COUNTS,
+    )
+    if config.serve_queries:
+        try:
+            start_query_service(HotData(data_path))
+        except OSError as e:
+            # most likely a standalone query service already holds the port
+            logger.error(f"Failed to start the query service: {e}")
 
     await asyncio.gather(
-        today_logger.poll_cpu(),
-        today_logger.poll_gpu(),
-        today_logger.poll_network(),
-        today_logger.poll_ups(),
+        today_logger.run_collectors(),
         today_logger.write_data(),
-        bulk_task(data_path, BULK_DATA, timedelta(hours=0, minutes=0)),
+        today_logger.checkpoint_aggregates(),
+        today_logger.roll_up(),
+        bulk_task(today_logger, BULK_DATA, timedelta(hours=0, minutes=0)),
     )
 
 
@@ -0,0 +1,52 @@
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+
+from app.data_logger.batch_writer import BatchWriterConfig
+from app.data_logger.bounded_queue import OverflowPolicy
+from app.shared.from_dict import from_dict
+
+GATEWAY = "gateway"  # resolved to the default route's router at start up
+
+
+@dataclass
+class PingTarget:
+    destination: str
+    interval: float = 1.0  # in seconds between probes
+    timeout: float = 5.0  # in seconds before a probe counts as a miss
+
+
+@dataclass
+class CollectorConfig:
+    enabled: bool = True
+    interval: float | None = None  # in seconds, None keeps the collector's default
+    timeout: float | None = None  # in seconds, None keeps the collector's default
+
+
+@dataclass
+class LoggerConfig:
+    collectors: dict[str, CollectorConfig] = field(default_factory=dict)
+    collector_modules: list[str] = field(default_factory=list)  # plugins to import
+    ping_targets: list[PingTarget] = field(
+        default_factory=lambda: [PingTarget(GATEWAY), PingTarget("www.google.com")]
+    )
+    max_pings_in_flight: int = 64
+    telemetry_interval: float = 10.0  # in seconds between LoggerData records
+    queue_size: int = 100_000  # samples buffered in memory for the writer
+    overflow_policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST
+    writer: BatchWriterConfig = field(default_factory=BatchWriterConfig)
+    # hosting the query service in the logger process makes request handling compete
+    # with the collectors for the GIL, run_query_service.py runs it on its own instead
+    serve_queries: bool = False
+
+
+def load_logger_config(path: str) -> LoggerConfig:
+    logger = logging.getLogger("data_logger")
+    if not os.path.isfile(path):
+        logger.info(f"No config at {path}, using defaults")
+        return LoggerConfig()
+    with open(path) as file:
+        config = from_dict(LoggerConfig, json.load(file))
+    logger.info(f"Loaded config from {path}: {len(config.ping_targets)} ping targets")
+    return config
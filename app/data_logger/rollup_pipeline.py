@@ -0,0 +1,152 @@
+import json
+import logging
+import math
+import os
+from dataclasses import dataclass
+
+from app.shared.aggregate_utils import get_series_key
+from app.shared.constants import ROLLUP_DATA, ROLLUP_RETENTION_DAYS
+from app.shared.online_aggregator import SampleSummary
+from app.shared.types import AggregateImpl, DataImpl
+
+
+@dataclass
+class RollupTier:
+    name: str
+    period: float  # in seconds
+    path: str
+    retention: float  # in seconds of rows kept in the file
+
+
+ROLLUP_TIERS = [
+    RollupTier("1m", 60.0, ROLLUP_DATA["1m"], ROLLUP_RETENTION_DAYS["1m"] * 86400.0),
+    RollupTier(
+        "15m", 15 * 60.0, ROLLUP_DATA["15m"], ROLLUP_RETENTION_DAYS["15m"] * 86400.0
+    ),
+    RollupTier("1h", 3600.0, ROLLUP_DATA["1h"], ROLLUP_RETENTION_DAYS["1h"] * 86400.0),
+]
+
+BucketKey = tuple[str, str, float]  # data type, series key, bucket start
+
+
+class RollupPipeline:
+    """
+    Downsamples samples into fixed size buckets. Each closed bucket is written to its
+    tier and merged into the enclosing bucket of the next, coarser tier.
+    """
+
+    def __init__(self, tiers: list[RollupTier] | None = None, grace: float = 300.0):
+        self.tiers = tiers if tiers is not None else ROLLUP_TIERS
+        self.grace = grace  # in seconds to wait for late samples
+        self.buckets: list[dict[BucketKey, SampleSummary]] = [{} for _ in self.tiers]
+        self.logger = logging.getLogger("data_logger")
+
+    def bucket_start(self, tier_index: int, timestamp: float) -> float:
+        period = self.tiers[tier_index].period
+        return math.floor(timestamp / period) * period
+
+    def add(self, row: DataImpl) -> None:
+        key = (
+            row.__class__.__name__,
+            get_series_key(row),
+            self.bucket_start(0, row.timestamp),
+        )
+        summary = self.buckets[0].get(key)
+        if summary is None:
+            summary = SampleSummary.for_row(row)
+            self.buckets[0][key] = summary
+        summary.add(row)
+
+    def close_buckets(self, now: float) -> dict[str, list[AggregateImpl]]:
+        closed: dict[str, list[AggregateImpl]] = {}
+        for tier_index, tier in enumerate(self.tiers):
+            buckets = self.buckets[tier_index]
+            for key in list(buckets.keys()):
+                data_type, series_key, start = key
+                if start + tier.period + self.grace > now:
+                    continue
+                summary = buckets.pop(key)
+                closed.setdefault(tier.name, []).append(summary.to_aggregate())
+                if tier_index + 1 < len(self.tiers):
+                    self.merge_up(tier_index + 1, summary, start)
+        return closed
+
+    def merge_up(self, tier_index: int, summary: SampleSummary, start: float) -> None:
+        key = (summary.type, summary.key, self.bucket_start(tier_index, start))
+        parent = self.buckets[tier_index].get(key)
+        if parent is None:
+            self.buckets[tier_index][key] = summary
+        else:
+            parent.merge(summary)
+
+    def write(self, closed: dict[str, list[AggregateImpl]]) -> None:
+        for tier in self.tiers:
+            rows = closed.get(tier.name, [])
+            if len(rows) == 0:
+                continue
+            rows.sort(key=lambda row: row.timestamp)
+            with open(tier.path, mode="a") as file:
+                for row in rows:
+                    json.dump(row.to_dict(), file)
+                    file.write("\n")
+            self.logger.debug(f"Wrote {len(rows)} records to {tier.path}")
+
+    def apply_retention(self, now: float) -> None:
+        """
+        Rewrites each tier file without the rows past its retention or lines that don't
+        decode, swapping it in once fully written. Readers notice the new file and
+        parse it again.
+        """
+        for tier in self.tiers:
+            if not os.path.isfile(tier.path):
+                continue
+            cutoff = now - tier.retention
+            temp_path = tier.path + ".tmp"
+            num_dropped = 0
+            with open(tier.path, "rb") as source, open(temp_path, "wb") as file:
+                for line in source:
+                    try:
+                        timestamp = float(json.loads(line)["timestamp"])
+                    except (ValueError, KeyError, TypeError) as e:
+                        # a torn or corrupt line must not stop the logger every restart
+                        self.logger.warning(f"Dropping bad line in {tier.path}: {e}")
+                        num_dropped += 1
+                        continue
+                    if timestamp > cutoff:
+                        file.write(line if line.endswith(b"\n") else line + b"\n")
+                    else:
+                        num_dropped += 1
+            if num_dropped == 0:
+                os.remove(temp_path)
+                continue
+            os.replace(temp_path, tier.path)
+            self.logger.info(
+                f"Removed {num_dropped} rows past retention from {tier.path}"
+            )
+
+    def checkpoint(self, path: str) -> None:
+        data = {
+            tier.name: [
+                {"start": key[2], "summary": summary.to_dict()}
+                for key, summary in buckets.items()
+            ]
+            for tier, buckets in zip(self.tiers, self.buckets)
+        }
+        temp_path = path + ".tmp"
+        with open(temp_path, "w") as file:
+            json.dump(data, file)
+        os.replace(temp_path, path)
+
+    def load_checkpoint(self, path: str) -> None:
+        if not os.path.isfile(path):
+            return
+        try:
+            with open(path) as file:
+                data = json.load(file)
+        except (OSError, json.JSONDecodeError) as e:
+            self.logger.error(f"Failed to load {path}: {e}")
+            return
+        for tier, buckets in zip(self.tiers, self.buckets):
+            for entry in data.get(tier.name, []):
+                summary = SampleSummary.from_dict(entry["summary"])
+                buckets[(summary.type, summary.key, entry["start"])] = summary
@@ -1,51 +1,233 @@
 import asyncio
-import json
 import logging
+import time
+from functools import partial
+from typing import Callable
 
-from app.data_logger.tools.cpu_usage import cpu_usage
-from app.data_logger.tools.network_health import MultiDestinationHealth
-from app.data_logger.tools.nvidia_smi import nvidia_smi
-from app.data_logger.tools.ups_stats import ups_stats
+from app.data_logger.batch_writer import BatchWriter, BatchWriterConfig
+from app.data_logger.bounded_queue import BoundedDataQueue
+from app.data_logger.collectors import (
+    CollectorResult,
+    CollectorSpec,
+    StartupCost,
+    StreamingCollector,
+    enabled_collectors,
+)
+from app.data_logger.logger_config import LoggerConfig
+from app.data_logger.rollup_pipeline import RollupPipeline
+from app.shared.aggregate_utils import DATA_CLASSES
+from app.shared.column_store import ColumnStoreWriter
 from app.shared.data_interface import DataInterface
+from app.shared.logger_data import CollectorData, LoggerData
+from app.shared.online_aggregator import OnlineAggregator
 
 
 class TodayLogger:
-    def __init__(self, data_path: str) -> None:
-        self.data_queue: asyncio.Queue[DataInterface] = asyncio.Queue()
+    def __init__(
+        self,
+        data_path: str,
+        writer_config: BatchWriterConfig | None = None,
+        column_path: str | None = None,
+        checkpoint_path: str | None = None,
+        rollup_checkpoint_path: str | None = None,
+        config: LoggerConfig | None = None,
+        drop_counts_path: str | None = None,
+    ) -> None:
+        self.config = config if config is not None else LoggerConfig()
+        self.data_queue = BoundedDataQueue(
+            self.config.queue_size, self.config.overflow_policy
+        )
+        self.drop_counts_path = drop_counts_path
+        if drop_counts_path is not None:
+            self.data_queue.load_drops(drop_counts_path)
         self.data_path = data_path
+        column_store = ColumnStoreWriter(column_path) if column_path else None
+        self.writer = BatchWriter(
+            data_path, writer_config, column_store, on_rotated=self.reset_aggregates
+        )
+        self.checkpoint_path = checkpoint_path
+        if checkpoint_path is None:
+            self.aggregator = OnlineAggregator()
+        else:
+            self.aggregator = OnlineAggregator.from_checkpoint(checkpoint_path)
+        self.rollups = RollupPipeline()
+        self.rollup_checkpoint_path = rollup_checkpoint_path
+        if rollup_checkpoint_path is not None:
+            self.rollups.load_checkpoint(rollup_checkpoint_path)
+        # slowest call of each polled collector since the last telemetry record
+        self.collector_durations: dict[str, float] = {}
         self.logger = logging.getLogger("data_logger")
 
-    async def poll_cpu(self) -> None:
+    async def put(self, data: DataInterface) -> None:
+        if data.__class__.__name__ not in DATA_CLASSES:
+            # a plugin returning some other type must not stop every collector
+            self.logger.error(f"Dropping row of unknown type {data.__class__.__name__}")
+            return
+        self.aggregator.add(data)  # type: ignore
+        self.rollups.add(data)  # type: ignore
+        await self.data_queue.put(data)
+
+    async def poll(
+        self,
+        name: str,
+        collect: Callable[[], CollectorResult],
+        interval: float,
+        timeout: float,
+    ) -> None:
+        """
+        Runs a blocking collector in a worker thread on a fixed rate schedule. A call
+        that outlives its timeout is left to finish in the background, and ticks are
+        skipped until it does, so that a hung source never piles up threads. Rows
+        carry the time they were sampled at, so late results are still queued.
+        """
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        running: asyncio.Future[CollectorResult] | None = None
         while True:
-            data = cpu_usage()
-            await self.data_queue.put(data)
-            await asyncio.sleep(1)
+            if running is not None and running.done():
+                await self.put_result(name, running)
+                running = None
+            if running is None:
+                running = asyncio.ensure_future(asyncio.to_thread(collect))
+                running.add_done_callback(
+                    partial(self.record_duration, name, loop.time())
+                )
+                done, _ = await asyncio.wait({running}, timeout=timeout)
+                if running in done:
+                    await self.put_result(name, running)
+                    running = None
+                else:
+                    self.logger.warning(f"{name} collector timed out after {timeout} s")
+            else:
+                self.logger.warning(f"{name} collector still running, skipping")
+            # keep the schedule anchored instead of drifting by the collection time
+            next_tick += interval
+            if next_tick < loop.time():
+                next_tick = loop.time()
+            await asyncio.sleep(next_tick - loop.time())
+
+    def record_duration(self, name: str, started: float, _: asyncio.Future) -> None:
+        duration = asyncio.get_running_loop().time() - started
+        self.collector_durations[name] = max(
+            self.collector_durations.get(name, 0.0), duration
+        )
+
+    async def put_result(
+        self, name: str, future: asyncio.Future[CollectorResult]
+    ) -> None:
+        try:
+            result = future.result()
+        except Exception as e:
+            self.logger.error(f"{name} collector failed: {e}")
+            return
+        if result is None:
+            return
+        for row in result if isinstance(result, list) else [result]:
+            await self.put(row)
+
+    async def run_collectors(self) -> None:
+        await asyncio.gather(
+            *[self.run_collector(spec) for spec in enabled_collectors(self.config)],
+            self.monitor(self.config.telemetry_interval),
+        )
+
+    async def run_collector(self, spec: CollectorSpec) -> None:
+        if not spec.available():
+            self.logger.info(f"{spec.name} collector not available on this host")
+            return
+        if spec.startup_cost == StartupCost.EXPENSIVE:
+            # let the cheap collectors start sampling meanwhile
+            collector = await asyncio.to_thread(spec.factory, spec, self.config)
+        else:
+            collector = spec.factory(spec, self.config)
+        self.logger.info(f"Started {spec.name} collector for {spec.data_type.__name__}")
+        if isinstance(collector, StreamingCollector):
+            await collector.run(self.put)
+        else:
+            await self.poll(spec.name, collector, spec.interval, spec.timeout)
 
-    async def poll_gpu(self) -> None:
+    async def monitor(self, interval: float, probe_interval: float = 0.1) -> None:
+        """
+        Queues a LoggerData record, and a CollectorData record per collector that
+        ran, every interval. Event loop lag is the worst delay seen waking up from
+        short sleeps, which grows when something blocks the loop.
+        """
+        loop = asyncio.get_running_loop()
+        stats = self.writer.stats
+        last_time = loop.time()
+        last_rows, last_batches = stats.rows_written, stats.batches_written
+        last_latency = stats.total_write_latency
+        last_drops = self.data_queue.total_drops
+        loop_lag = 0.0
         while True:
-            data = nvidia_smi()
-            for row in data:
-                await self.data_queue.put(row)
-            await asyncio.sleep(1)
+            expected = loop.time() + probe_interval
+            await asyncio.sleep(probe_interval)
+            loop_lag = max(loop_lag, loop.time() - expected)
+            elapsed = loop.time() - last_time
+            if elapsed < interval:
+                continue
 
-    async def poll_network(self) -> None:
-        net_health = MultiDestinationHealth()
+            batches = stats.batches_written - last_batches
+            write_latency = stats.total_write_latency - last_latency
+            slowest, duration = max(
+                self.collector_durations.items(),
+                key=lambda item: item[1],
+                default=("", 0.0),
+            )
+            now = time.time()
+            await self.put(
+                LoggerData(
+                    timestamp=now,
+                    queue_depth=self.data_queue.qsize(),
+                    loop_lag_ms=loop_lag * 1000,
+                    rows_per_second=(stats.rows_written - last_rows) / elapsed,
+                    write_latency_ms=write_latency / batches * 1000 if batches else 0.0,
+                    collector_ms=duration * 1000,
+                    slowest_collector=slowest,
+                    dropped_rows=self.data_queue.total_drops - last_drops,
+                )
+            )
+            for name, seconds in self.collector_durations.items():
+                await self.put(CollectorData(now, name, seconds * 1000))
+            if self.drop_counts_path and self.data_queue.total_drops != last_drops:
+                self.data_queue.save_drops(self.drop_counts_path)
+
+            last_time = loop.time()
+            last_rows, last_batches = stats.rows_written, stats.batches_written
+            last_latency = stats.total_write_latency
+            last_drops = self.data_queue.total_drops
+            loop_lag = 0.0
+            self.collector_durations = {}
+
+    def reset_aggregates(self, pending: list[DataInterface]) -> None:
+        # bulk_up_todays_data.py rotated the day file and aggregated it itself,
+        # only the rows about to go into the fresh file still count towards today
+        self.logger.info("Day file rotated externally, discarding today's aggregates")
+        self.aggregator.flush()
+        for row in pending:
+            self.aggregator.add(row)  # type: ignore
+        if self.checkpoint_path is not None:
+            self.aggregator.checkpoint(self.checkpoint_path)
+
+    async def checkpoint_aggregates(self, interval: float = 60.0) -> None:
+        if self.checkpoint_path is None:
+            return
         while True:
-            data = net_health.get_data()
-            for row in data:
-                await self.data_queue.put(row)
-            await asyncio.sleep(1)
+            await asyncio.sleep(interval)
+            self.aggregator.checkpoint(self.checkpoint_path)
 
-    async def poll_ups(self) -> None:
+    async def roll_up(self, interval: float = 10.0) -> None:
+        last_retention = 0.0
         while True:
-            data = ups_stats()
-            if data is not None:
-                await self.data_queue.put(data)
-            await asyncio.sleep(60)
+            await asyncio.sleep(interval)
+            self.rollups.write(self.rollups.close_buckets(time.time()))
+            if time.time() - last_retention > 86400.0:
+                # in this task, so that no bucket is appended while a file is rewritten
+                await asyncio.to_thread(self.rollups.apply_retention, time.time())
+                last_retention = time.time()
+            if self.rollup_checkpoint_path is not None:
+                self.rollups.checkpoint(self.rollup_checkpoint_path)
 
     async def write_data(self) -> None:
-        while True:
-            with open(self.data_path, mode="a") as file:
-                data = await self.data_queue.get()
-                json.dump(data.to_dict(), file)
-                file.write("\n")
+        with self.writer:
+            await self.writer.run(self.data_queue)
@@ -0,0 +1,177 @@
+import argparse
+import asyncio
+import logging
+import os
+import socket
+import struct
+import time
+
+from app.data_logger.tools.ping import parse_ping_output, ping_command
+
+ICMP_ECHO_REQUEST = 8
+ICMP_ECHO_REPLY = 0
+PAYLOAD = b"server-dashboard"
+
+
+def checksum(packet: bytes) -> int:
+    if len(packet) % 2:
+        packet += b"\0"
+    total = sum(struct.unpack(f"!{len(packet) // 2}H", packet))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def echo_request(identifier: int, sequence: int) -> bytes:
+    header = struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, 0, identifier, sequence)
+    packet_checksum = checksum(header + PAYLOAD)
+    header = struct.pack(
+        "!BBHHH", ICMP_ECHO_REQUEST, 0, packet_checksum, identifier, sequence
+    )
+    return header + PAYLOAD
+
+
+def open_icmp_socket() -> tuple[socket.socket, bool] | None:
+    """
+    Prefers an unprivileged datagram ICMP socket (allowed by net.ipv4.ping_group_range)
+    and falls back to a raw socket when running as root. Returns the socket and
+    whether replies come with an IP header in front.
+    """
+    for kind, has_ip_header in [(socket.SOCK_DGRAM, False), (socket.SOCK_RAW, True)]:
+        try:
+            sock = socket.socket(socket.AF_INET, kind, socket.IPPROTO_ICMP)
+        except OSError:
+            continue
+        sock.setblocking(False)
+        return sock, has_ip_header
+    return None
+
+
+class AsyncPinger:
+    """
+    Pings any number of hosts over one ICMP socket, matching replies to requests by
+    sequence number. Without ICMP socket access every probe runs the ping command
+    as a subprocess instead. Lost or timed out probes report NaN.
+    """
+
+    def __init__(self) -> None:
+        self.sock: socket.socket | None = None
+        self.has_ip_header = False
+        self.opened = False
+        self.identifier = os.getpid() & 0xFFFF
+        self.sequence = 0
+        self.pending: dict[int, tuple[str, asyncio.Future[float]]] = {}
+        self.logger = logging.getLogger("data_logger")
+
+    def open(self) -> None:
+        if self.opened:
+            return
+        self.opened = True
+        opened = open_icmp_socket()
+        if opened is None:
+            self.logger.warning("No ICMP socket access, falling back to ping command")
+            return
+        self.sock, self.has_ip_header = opened
+        asyncio.get_running_loop().add_reader(self.sock.fileno(), self.receive)
+
+    def close(self) -> None:
+        if self.sock is not None:
+            asyncio.get_running_loop().remove_reader(self.sock.fileno())
+            self.sock.close()
+            self.sock = None
+        self.opened = False
+
+    def next_sequence(self) -> int:
+        while True:
+            self.sequence = (self.sequence + 1) & 0xFFFF
+            if self.sequence not in self.pending:
+                return self.sequence
+
+    def receive(self) -> None:
+        assert self.sock is not None
+        while True:
+            try:
+                packet, (address, _) = self.sock.recvfrom(2048)
+            except (BlockingIOError, InterruptedError):
+                return
+            received = time.perf_counter()
+            if self.has_ip_header:
+                packet = packet[(packet[0] & 0x0F) * 4 :]
+            if len(packet) < 8:
+                continue
+            kind, _, _, identifier, sequence = struct.unpack("!BBHHH", packet[:8])
+            # datagram sockets get their identifier rewritten by the kernel
+            if kind != ICMP_ECHO_REPLY or (
+                self.has_ip_header and identifier != self.identifier
+            ):
+                continue
+            host, future = self.pending.get(sequence, (None, None))
+            if future is not None and host == address and not future.done():
+                future.set_result(received)
+
+    async def ping(self, host: str, timeout: float) -> float:
+        """Returns the round trip time to host in milliseconds, NaN if it was lost."""
+        self.open()
+        if self.sock is None:
+            return await self.ping_subprocess(host, timeout)
+        loop = asyncio.get_running_loop()
+        try:
+            addresses = await loop.getaddrinfo(host, None, family=socket.AF_INET)
+        except socket.gaierror:
+            return float("nan")
+        address = addresses[0][4][0]
+        sequence = self.next_sequence()
+        future = loop.create_future()
+        self.pending[sequence] = (address, future)
+        try:
+            sent = time.perf_counter()
+            self.sock.sendto(echo_request(self.identifier, sequence), (address, 0))
+            received = await asyncio.wait_for(future, timeout)
+            return (received - sent) * 1000.0
+        except (asyncio.TimeoutError, OSError):
+            return float("nan")
+        finally:
+            del self.pending[sequence]
+
+    async def ping_subprocess(self, host: str, timeout: float) -> float:
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *ping_command(host, max(1, round(timeout))),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        except FileNotFoundError:
+            self.logger.error("ping command not found")
+            return float("nan")
+        stdout, _ = await process.communicate()
+        if process.returncode != 0:
+            return float("nan")
+        try:
+            return parse_ping_output(stdout.decode("utf-8"))
+        except ValueError as e:
+            # a localized or unusual ping, counted as a miss like a timeout
+            self.logger.warning(str(e))
+            return float("nan")
+
+
+async def ping_hosts(hosts: list[str], count: int, interval: float) -> None:
+    pinger = AsyncPinger()
+    for _ in range(count):
+        times = await asyncio.gather(*[pinger.ping(host, 1.0) for host in hosts])
+        for host, ping_ms in zip(hosts, times):
+            print(f"{host}: {ping_ms:.3f} ms")
+        await asyncio.sleep(interval)
+    pinger.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Ping hosts over one ICMP socket")
+    parser.add_argument("hosts", nargs="*", default=["127.0.0.1"])
+    parser.add_argument("--count", type=int, default=4)
+    parser.add_argument("--interval", type=float, default=0.2)
+    args = parser.parse_args()
+    asyncio.run(ping_hosts(args.hosts, args.count, args.interval))
+
+
+if __name__ == "__main__":
+    main()
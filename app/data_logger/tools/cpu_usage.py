@@ -27,13 +27,15 @@ def get_cpu_temperatures() -> list[float]:
 
 
 def cpu_usage() -> CpuData:
+    # taken first, reading the temperature sensors can stall
+    timestamp = datetime.datetime.now().timestamp()
     cpu_percent = psutil.cpu_percent()
     virtual_memory = psutil.virtual_memory()
     virtual_memory_free = virtual_memory.free / 1024**2
     virtual_memory_used = virtual_memory.used / 1024**2
     average_temperature = float(np.mean(get_cpu_temperatures()))
     return CpuData(
-        timestamp=datetime.datetime.now().timestamp(),
+        timestamp=timestamp,
         utilization=cpu_percent,
         memory_used=virtual_memory_used,
         memory_free=virtual_memory_free,
@@ -1,48 +1,71 @@
+import asyncio
 import datetime
-import threading
-import time
-from queue import Queue
+import heapq
+import logging
+from typing import Awaitable, Callable
 
 import netifaces
 
-from app.data_logger.tools.ping import ping
+from app.data_logger.logger_config import GATEWAY, PingTarget
+from app.data_logger.tools.async_ping import AsyncPinger
 from app.shared.network_data import NetworkData
 
+PutData = Callable[[NetworkData], Awaitable[None]]
 
-class NetworkHealthManager:
-    def __init__(self, destination: str) -> None:
-        self.destination = destination
-        self.poll_thread = threading.Thread(target=self.poll, daemon=True)
-        self.poll_thread.start()
-        self.queue = Queue()
 
-    def poll(self) -> None:
-        while True:
-            ping_time = ping(self.destination, timeout=5)
-            self.queue.put(
-                NetworkData(
-                    timestamp=datetime.datetime.now().timestamp(),
-                    destination=self.destination,
-                    ping_ms=ping_time,
-                )
-            )
-            time.sleep(1)
-
-    def get_data(self) -> list[NetworkData]:
-        data = []
-        while not self.queue.empty():
-            data.append(self.queue.get())
-        return data
+def get_router() -> str:
+    gateways = netifaces.gateways()
+    return list(gateways["default"].values())[0][0]
 
 
 class MultiDestinationHealth:
-    def __init__(self) -> None:
-        self.local_health = NetworkHealthManager(self.get_router())
-        self.internet_health = NetworkHealthManager("www.google.com")
+    """
+    Probes every target on its own interval from a single scheduler. Targets wait in
+    a heap ordered by when they are next due, and at most max_in_flight probes run
+    at once, so hundreds of destinations cost neither threads nor unbounded tasks.
+    """
+
+    def __init__(self, targets: list[PingTarget], max_in_flight: int = 64) -> None:
+        self.targets = [self.resolve(target) for target in targets]
+        self.pinger = AsyncPinger()
+        self.slots = asyncio.Semaphore(max_in_flight)
+        self.probes: set[asyncio.Task] = set()
+        self.logger = logging.getLogger("data_logger")
 
-    def get_router(self) -> str:
-        gateways = netifaces.gateways()
-        return list(gateways["default"].values())[0][0]
+    def resolve(self, target: PingTarget) -> PingTarget:
+        if target.destination != GATEWAY:
+            return target
+        return PingTarget(get_router(), target.interval, target.timeout)
+
+    async def probe(self, target: PingTarget, put: PutData) -> None:
+        try:
+            timestamp = datetime.datetime.now().timestamp()
+            ping_time = await self.pinger.ping(target.destination, target.timeout)
+            await put(
+                NetworkData(
+                    timestamp=timestamp,
+                    destination=target.destination,
+                    ping_ms=ping_time,
+                )
+            )
+        finally:
+            self.slots.release()
 
-    def get_data(self) -> list[NetworkData]:
-        return self.local_health.get_data() + self.internet_health.get_data()
+    async def run(self, put: PutData) -> None:
+        loop = asyncio.get_running_loop()
+        schedule = [(loop.time(), index) for index in range(len(self.targets))]
+        heapq.heapify(schedule)
+        while len(schedule) > 0:
+            due, index = schedule[0]
+            if due > loop.time():
+                await asyncio.sleep(due - loop.time())
+                continue
+            heapq.heappop(schedule)
+            # waits here when the fleet outpaces the probes in flight
+            await self.slots.acquire()
+            target = self.targets[index]
+            task = asyncio.create_task(self.probe(target, put))
+            self.probes.add(task)
+            task.add_done_callback(self.probes.discard)
+            next_due = max(due + target.interval, loop.time())
+            heapq.heappush(schedule, (next_due, index))
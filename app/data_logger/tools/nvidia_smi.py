@@ -66,10 +66,3 @@ class NvidiaSmiManager:
             )
             all_data.append(data)
         return all_data
-
-
-NVIDIA_SMI_MANAGER = NvidiaSmiManager(poll_interval=1.0)
-
-
-def nvidia_smi() -> list[GpuData]:
-    return NVIDIA_SMI_MANAGER.get_data()
@@ -0,0 +1,196 @@
+import logging
+import os
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.shared.aggregate_store import AggregateStore, StoreVersion, bulk_store
+from app.shared.aggregate_utils import (
+    AGGREGATE_CLASSES,
+    DATA_CLASSES,
+    DEFAULT_SERIES_KEY,
+    decode_aggregate,
+    decode_data,
+)
+from app.shared.column_series import ColumnSeries, SeriesMap, group_into_series
+from app.shared.constants import (
+    AGGREGATE_CHECKPOINT,
+    BULK_DATA,
+    ROLLUP_DATA,
+    TODAYS_DATA,
+)
+from app.shared.downsample import downsample_indices
+from app.shared.file_identity import FileIdentity, file_identity
+from app.shared.online_aggregator import read_partial_aggregates
+from app.shared.read_json_lines import read_json_lines
+from app.shared.segments import latest_segment
+from app.shared.today_cache import SharedTodayCache
+
+
+@dataclass
+class SeriesQuery:
+    type: str  # a *Data or *AggregatedData class name
+    key: str = DEFAULT_SERIES_KEY
+    fields: list[str] | None = None  # None returns every field
+    start: float | None = None  # exclusive, in seconds since the epoch
+    end: float | None = None  # inclusive, in seconds since the epoch
+    max_points: int | None = None  # per field, keeping peaks and gaps
+    resolution: str = "1d"  # which aggregate file, ignored for raw data
+
+
+def decimate(columns: dict[str, np.ndarray], max_points: int) -> dict[str, np.ndarray]:
+    """
+    Keeps the rows that downsample_indices picks for any numeric field, so every
+    field keeps its peaks and gaps as the dashboard would draw them. That is up to
+    max_points rows per field, which the dashboard then thins per field again.
+    """
+    count = len(columns["timestamp"])
+    if count <= max_points:
+        return columns
+    selected = [np.array([0, count - 1])]
+    for name, column in columns.items():
+        if name != "timestamp" and np.issubdtype(column.dtype, np.number):
+            selected.append(downsample_indices(column.astype(float), max_points))
+    indices = np.unique(np.concatenate(selected))
+    return {name: column[indices] for name, column in columns.items()}
+
+
+class HotData:
+    """
+    Series of the last two days of samples and of every aggregate file, held in
+    memory and refreshed from disk when the files change, so any number of readers
+    can query them without parsing the files again. The dashboard also queries one
+    in process when the query service isn't running.
+    """
+
+    def __init__(
+        self, today_path: str = TODAYS_DATA, logger_name: str = "query_service"
+    ) -> None:
+        self.logger_name = logger_name
+        self.today = SharedTodayCache(today_path, logger_name)
+        self.rollups = {
+            resolution: SharedTodayCache(path, logger_name, decode_aggregate)
+            for resolution, path in ROLLUP_DATA.items()
+        }
+        self.lock = threading.Lock()
+        # by slot, "yesterday" or "1d", so a rotated segment is let go
+        self.files: dict[str, tuple[str, FileIdentity, SeriesMap]] = {}
+        # by type and columns read, None for every type or column
+        self.store_series: dict[
+            tuple[str | None, tuple[str, ...] | None], tuple[StoreVersion, SeriesMap]
+        ] = {}
+
+    def load_file(self, slot: str, path: str, raw: bool) -> SeriesMap:
+        logger = logging.getLogger(self.logger_name)
+        with self.lock:
+            # taken before reading so that anything appended meanwhile counts as a change
+            identity = file_identity(path)
+            cached = self.files.get(slot)
+            if cached is not None and cached[0] == path and identity.matches(cached[1]):
+                return cached[2]
+            data = []
+            if os.path.isfile(path):
+                decode = decode_data if raw else decode_aggregate
+                with open(path, "rb") as file:
+                    data = [decode(data_dict) for data_dict in read_json_lines(file)]
+            logger.debug(f"Loaded {len(data)} rows from {path}")
+            series = {
+                key: value.snapshot() for key, value in group_into_series(data).items()
+            }
+            self.files[slot] = (path, identity, series)
+            return series
+
+    def load_store(
+        self,
+        store: AggregateStore,
+        type_name: str | None = None,
+        fields: list[str] | None = None,
+    ) -> SeriesMap:
+        slot = (type_name, tuple(fields) if fields is not None else None)
+        with self.lock:
+            version = store.version()
+            cached = self.store_series.get(slot)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+            series = store.read(
+                [type_name] if type_name is not None else None, columns=fields
+            )
+            logging.getLogger(self.logger_name).debug(
+                f"Loaded {len(series)} series from {store.root}"
+            )
+            self.store_series[slot] = (version, series)
+            return series
+
+    def raw_series(self) -> list[SeriesMap]:
+        return [
+            self.load_file("yesterday", latest_segment(), raw=True),
+            self.today.load(0),
+        ]
+
+    def aggregate_series(
+        self,
+        resolution: str,
+        type_name: str | None = None,
+        fields: list[str] | None = None,
+    ) -> list[SeriesMap]:
+        """Type name and fields only narrow what is read from the aggregate store."""
+        if resolution in self.rollups:
+            # appended to as buckets close, so only the new rows are parsed
+            return [self.rollups[resolution].load(0)]
+        if resolution != "1d":
+            raise ValueError(f"Unknown resolution: {resolution}")
+        store = bulk_store()
+        if store is not None:
+            series = [self.load_store(store, type_name, fields)]
+        else:
+            series = [self.load_file(resolution, BULK_DATA, raw=False)]
+        # today's running aggregates from the logger's checkpoint
+        series.append(group_into_series(read_partial_aggregates(AGGREGATE_CHECKPOINT)))
+        return series
+
+    def series_maps(
+        self, type_name: str, resolution: str, fields: list[str] | None = None
+    ) -> list[SeriesMap]:
+        if type_name in DATA_CLASSES:
+            return self.raw_series()
+        if type_name in AGGREGATE_CLASSES:
+            return self.aggregate_series(resolution, type_name, fields)
+        raise ValueError(f"Unknown data type: {type_name}")
+
+    def keys(
+        self, resolution: str = "1d", type_name: str | None = None
+    ) -> dict[str, list[str]]:
+        if type_name is None:
+            series_maps = self.raw_series() + self.aggregate_series(resolution)
+        else:
+            # only the timestamps and keys are read from the aggregate store
+            series_maps = self.series_maps(type_name, resolution, [])
+        keys: dict[str, set[str]] = {}
+        for series_map in series_maps:
+            for name, key in series_map:
+                if type_name is None or name == type_name:
+                    keys.setdefault(name, set()).add(key)
+        return {name: sorted(names) for name, names in keys.items()}
+
+    def series(self, query: SeriesQuery) -> ColumnSeries:
+        series_maps = self.series_maps(query.type, query.resolution, query.fields)
+        data_class = DATA_CLASSES.get(query.type) or AGGREGATE_CLASSES[query.type]
+        start = query.start if query.start is not None else -np.inf
+        key = (query.type, query.key)
+        parts = [
+            series_map[key].window(start, query.end)
+            for series_map in series_maps
+            if key in series_map
+        ]
+        series = ColumnSeries.concat(data_class, parts)
+        columns = series.columns
+        if query.fields is not None:
+            unknown = set(query.fields) - set(columns)
+            if unknown:
+                raise ValueError(f"Unknown fields for {query.type}: {sorted(unknown)}")
+            names = dict.fromkeys(["timestamp", *query.fields])
+            columns = {name: columns[name] for name in names}
+        if query.max_points is not None:
+            columns = decimate(columns, query.max_points)
+        return ColumnSeries(data_class, columns)
@@ -0,0 +1,84 @@
+import json
+from urllib.parse import urlencode
+from urllib.request import Request, urlopen
+
+import numpy as np
+
+from app.query_service.hot_data import SeriesQuery
+from app.query_service.query_server import ARROW_STREAM
+from app.shared.aggregate_utils import DATA_CLASSES, get_aggregate_class_from_name
+from app.shared.column_series import ColumnSeries, series_dtype
+from app.shared.column_store import column_specs
+from app.shared.constants import QUERY_SERVICE_HOST, QUERY_SERVICE_PORT
+
+try:
+    import pyarrow
+    from pyarrow import ipc
+except ImportError:  # fall back to JSON responses
+    pyarrow = None
+
+
+class QueryClient:
+    """
+    Reads series from a running query service. Failing to reach it raises OSError,
+    so callers can fall back to reading the files themselves.
+    """
+
+    def __init__(
+        self,
+        host: str = QUERY_SERVICE_HOST,
+        port: int = QUERY_SERVICE_PORT,
+        timeout: float = 5.0,
+    ) -> None:
+        self.url = f"http://{host}:{port}"
+        self.timeout = timeout
+
+    def get(self, path: str, params: dict, accept: str = "application/json") -> bytes:
+        request = Request(
+            f"{self.url}{path}?{urlencode(params)}", headers={"Accept": accept}
+        )
+        with urlopen(request, timeout=self.timeout) as response:
+            return response.read()
+
+    def keys(
+        self, resolution: str = "1d", type_name: str | None = None
+    ) -> dict[str, list[str]]:
+        params = {"resolution": resolution}
+        if type_name is not None:
+            params["type"] = type_name
+        return json.loads(self.get("/keys", params))
+
+    def series(self, query: SeriesQuery) -> ColumnSeries:
+        data_class = DATA_CLASSES.get(query.type) or get_aggregate_class_from_name(
+            query.type
+        )
+        params = {
+            name: value
+            for name, value in {
+                "type": query.type,
+                "key": query.key,
+                "start": query.start,
+                "end": query.end,
+                "max_points": query.max_points,
+                "resolution": query.resolution,
+            }.items()
+            if value is not None
+        }
+        if query.fields is not None:
+            params["fields"] = ",".join(query.fields)
+        dtypes = {spec.name: series_dtype(spec) for spec in column_specs(data_class)}
+        if pyarrow is not None:
+            body = self.get("/series", {**params, "format": "arrow"}, ARROW_STREAM)
+            table = ipc.open_stream(body).read_all()
+            columns = {
+                name: table.column(name).to_numpy().astype(dtypes[name], copy=False)
+                for name in table.column_names
+            }
+        else:
+            body = self.get("/series", params)
+            # missing samples arrive as null, which become NaN in a float column
+            columns = {
+                name: np.array(values, dtype=dtypes[name])
+                for name, values in json.loads(body)["columns"].items()
+            }
+        return ColumnSeries(data_class, columns)
@@ -0,0 +1,157 @@
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from app.query_service.hot_data import HotData, SeriesQuery
+from app.shared.column_series import ColumnSeries
+from app.shared.constants import QUERY_SERVICE_HOST, QUERY_SERVICE_PORT
+from app.shared.initialize_logs import initialize_logs
+
+try:
+    import pyarrow
+    from pyarrow import ipc
+except ImportError:  # Arrow responses are optional, JSON always works
+    pyarrow = None
+
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+
+
+def parse_query(params: dict[str, list[str]]) -> SeriesQuery:
+    def value(name: str) -> str | None:
+        return params[name][-1] if name in params else None
+
+    type_name = value("type")
+    if type_name is None:
+        raise ValueError("Missing parameter: type")
+    query = SeriesQuery(type_name)
+    if value("key") is not None:
+        query.key = value("key")
+    if value("fields") is not None:
+        query.fields = [name for name in value("fields").split(",") if name]
+    if value("start") is not None:
+        query.start = float(value("start"))
+    if value("end") is not None:
+        query.end = float(value("end"))
+    if value("max_points") is not None:
+        query.max_points = max(2, int(value("max_points")))
+    if value("resolution") is not None:
+        query.resolution = value("resolution")
+    return query
+
+
+def json_column(column: np.ndarray) -> list:
+    # NaN isn't valid JSON, missing samples go out as null
+    if column.dtype.kind == "f" and np.isnan(column).any():
+        return np.where(np.isnan(column), None, column).tolist()
+    return column.tolist()
+
+
+def encode_json(query: SeriesQuery, series: ColumnSeries) -> bytes:
+    body = {
+        "type": query.type,
+        "key": query.key,
+        "columns": {
+            name: json_column(column) for name, column in series.columns.items()
+        },
+    }
+    return json.dumps(body, separators=(",", ":")).encode()
+
+
+def encode_arrow(query: SeriesQuery, series: ColumnSeries) -> bytes:
+    table = pyarrow.table(
+        series.columns, metadata={"type": query.type, "key": query.key}
+    )
+    sink = pyarrow.BufferOutputStream()
+    with ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+class QueryServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, hot_data: HotData, host: str, port: int) -> None:
+        super().__init__((host, port), QueryHandler)
+        self.hot_data = hot_data
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+    """
+    GET /keys?resolution=1d&type= lists the series keys of every type, or of one.
+    GET /series?type=&key=&fields=&start=&end=&max_points=&resolution=&format=
+    returns one series as compact JSON, or as an Arrow IPC stream when format=arrow
+    or the Accept header asks for it.
+    """
+
+    server: QueryServer
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+        try:
+            if url.path == "/keys":
+                resolution = params.get("resolution", ["1d"])[-1]
+                type_name = params.get("type", [None])[-1]
+                keys = self.server.hot_data.keys(resolution, type_name)
+                self.respond(200, "application/json", json.dumps(keys).encode())
+            elif url.path == "/series":
+                self.send_series(params)
+            else:
+                self.respond_error(404, f"Unknown path: {url.path}")
+        except ValueError as e:
+            self.respond_error(400, str(e))
+
+    def send_series(self, params: dict[str, list[str]]) -> None:
+        query = parse_query(params)
+        arrow = params.get("format", [""])[-1] == "arrow"
+        arrow = arrow or ARROW_STREAM in self.headers.get("Accept", "")
+        if arrow and pyarrow is None:
+            self.respond_error(406, "pyarrow is not installed, use format=json")
+            return
+        series = self.server.hot_data.series(query)
+        if arrow:
+            self.respond(200, ARROW_STREAM, encode_arrow(query, series))
+        else:
+            self.respond(200, "application/json", encode_json(query, series))
+
+    def respond(self, status: int, content_type: str, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def respond_error(self, status: int, message: str) -> None:
+        self.respond(
+            status, "application/json", json.dumps({"error": message}).encode()
+        )
+
+    def log_message(self, format: str, *args) -> None:
+        logging.getLogger("query_service").debug(format % args)
+
+
+def start_query_service(
+    hot_data: HotData | None = None,
+    host: str = QUERY_SERVICE_HOST,
+    port: int = QUERY_SERVICE_PORT,
+) -> QueryServer:
+    """Serves queries from a daemon thread, for running inside another process."""
+    server = QueryServer(hot_data or HotData(), host, port)
+    thread = threading.Thread(
+        target=server.serve_forever, name="query_service", daemon=True
+    )
+    thread.start()
+    logging.getLogger("query_service").info(f"Serving queries on {host}:{port}")
+    return server
+
+
+def main() -> None:
+    initialize_logs("query_service")
+    logger = logging.getLogger("query_service")
+    server = QueryServer(HotData(), QUERY_SERVICE_HOST, QUERY_SERVICE_PORT)
+    logger.info(f"Serving queries on {QUERY_SERVICE_HOST}:{QUERY_SERVICE_PORT}")
+    server.serve_forever()
@@ -1,5 +1,11 @@
 from .cpu_data import CpuAggregatedData, CpuData
 from .gpu_data import GpuAggregatedData, GpuData
+from .logger_data import (
+    CollectorAggregatedData,
+    CollectorData,
+    LoggerAggregatedData,
+    LoggerData,
+)
 from .network_data import NetworkAggregatedData, NetworkData
 from .ups_data import UpsAggregatedData, UpsData
 
@@ -12,4 +18,8 @@ __all__ = [
     "NetworkAggregatedData",
     "UpsData",
     "UpsAggregatedData",
+    "LoggerData",
+    "LoggerAggregatedData",
+    "CollectorData",
+    "CollectorAggregatedData",
 ]
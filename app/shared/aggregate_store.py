@@ -0,0 +1,201 @@
+import os
+import shutil
+from datetime import datetime, timezone
+from typing import Iterable
+
+import numpy as np
+
+from app.shared.aggregate_utils import (
+    AGGREGATE_CLASSES,
+    DEFAULT_SERIES_KEY,
+    SERIES_KEY_FIELDS,
+    group_by_type,
+)
+from app.shared.column_series import ColumnSeries, SeriesMap
+from app.shared.constants import AGGREGATE_STORE, BULK_ENGINE
+from app.shared.types import AggregateImpl
+
+try:
+    import pyarrow
+    from pyarrow import dataset, parquet
+except ImportError:  # only needed when the bulk engine is "parquet"
+    pyarrow = None
+
+ROW_GROUP_SIZE = 4096  # rows, each group keeps min/max statistics for pushdown
+
+StoreVersion = tuple[tuple[str, int, int], ...]  # path, size, mtime of each file
+
+
+def month_of(timestamp: float) -> tuple[int, int]:
+    # partitions follow UTC months, so a file never depends on the local time zone
+    moment = datetime.fromtimestamp(timestamp, timezone.utc)
+    return moment.year, moment.month
+
+
+def split_series(type_name: str, columns: dict[str, np.ndarray]) -> SeriesMap:
+    data_class = AGGREGATE_CLASSES[type_name]
+    key_field = SERIES_KEY_FIELDS[type_name]
+    if key_field is None or key_field not in columns:
+        return {
+            (type_name, DEFAULT_SERIES_KEY): ColumnSeries.from_columns(
+                data_class, columns
+            )
+        }
+    series = {}
+    keys = columns[key_field]
+    for key in np.unique(keys):
+        mask = keys == key
+        series[(type_name, str(key))] = ColumnSeries.from_columns(
+            data_class, {name: column[mask] for name, column in columns.items()}
+        )
+    return series
+
+
+class AggregateStore:
+    """
+    Aggregates in Parquet files partitioned by type, year and month, as
+    root/type=CpuAggregatedData/year=2024/month=5/data.parquet. Reads prune whole
+    months by partition and skip row groups by their timestamp statistics, and
+    only decode the requested columns.
+    """
+
+    def __init__(self, root: str = AGGREGATE_STORE) -> None:
+        if pyarrow is None:
+            raise ImportError("The aggregate store needs pyarrow, pip install pyarrow")
+        self.root = root
+
+    def partition_path(self, type_name: str, year: int, month: int) -> str:
+        return os.path.join(
+            self.root, f"type={type_name}", f"year={year}", f"month={month}"
+        )
+
+    def type_names(self) -> list[str]:
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            name.removeprefix("type=")
+            for name in os.listdir(self.root)
+            if name.removeprefix("type=") in AGGREGATE_CLASSES
+        )
+
+    def version(self) -> StoreVersion:
+        files = []
+        for directory, _, names in os.walk(self.root):
+            for name in names:
+                stat = os.stat(os.path.join(directory, name))
+                files.append(
+                    (os.path.join(directory, name), stat.st_size, stat.st_mtime_ns)
+                )
+        return tuple(sorted(files))
+
+    def write_partition(self, path: str, series: ColumnSeries) -> None:
+        os.makedirs(path, exist_ok=True)
+        file_path = os.path.join(path, "data.parquet")
+        # dataset discovery skips dot files, so readers never see a partial write
+        temp_path = os.path.join(path, ".data.parquet.tmp")
+        table = pyarrow.table(series.columns)
+        parquet.write_table(table, temp_path, row_group_size=ROW_GROUP_SIZE)
+        os.replace(temp_path, file_path)
+
+    def read_partition(self, path: str, data_class: type) -> ColumnSeries:
+        file_path = os.path.join(path, "data.parquet")
+        series = ColumnSeries(data_class)
+        if os.path.isfile(file_path):
+            table = parquet.read_table(file_path)
+            series.extend_columns(
+                {name: table.column(name).to_numpy() for name in table.column_names}
+            )
+        return series
+
+    def append(self, rows: list[AggregateImpl]) -> None:
+        # a day adds a few dozen rows, so rewriting the month's file stays cheap
+        for type_name, type_rows in group_by_type(rows).items():
+            by_month: dict[tuple[int, int], list[AggregateImpl]] = {}
+            for row in type_rows:
+                by_month.setdefault(month_of(row.timestamp), []).append(row)
+            for (year, month), month_rows in by_month.items():
+                path = self.partition_path(type_name, year, month)
+                series = self.read_partition(path, AGGREGATE_CLASSES[type_name])
+                series.extend(month_rows)
+                self.write_partition(path, series)
+
+    def rewrite(self, rows: Iterable[AggregateImpl]) -> int:
+        """Replaces the whole store with rows, swapping it in once fully written."""
+        staging = AggregateStore(self.root + ".tmp")
+        shutil.rmtree(staging.root, ignore_errors=True)
+        rows = list(rows)
+        staging.append(rows)
+        os.makedirs(staging.root, exist_ok=True)
+        old_root = self.root + ".old"
+        if os.path.isdir(self.root):
+            os.replace(self.root, old_root)
+        os.replace(staging.root, self.root)
+        shutil.rmtree(old_root, ignore_errors=True)
+        return len(rows)
+
+    def read_columns(
+        self,
+        type_name: str,
+        start: float | None = None,
+        end: float | None = None,
+        columns: list[str] | None = None,
+    ) -> dict[str, np.ndarray]:
+        path = os.path.join(self.root, f"type={type_name}")
+        if not os.path.isdir(path):
+            return {}
+        # every partition of one type shares its schema, types are read one by one
+        source = dataset.dataset(path, format="parquet", partitioning="hive")
+        condition = None
+        if start is not None:
+            year, month = month_of(start)
+            condition = (dataset.field("timestamp") > start) & (
+                (dataset.field("year") > year)
+                | ((dataset.field("year") == year) & (dataset.field("month") >= month))
+            )
+        if end is not None:
+            year, month = month_of(end)
+            up_to_end = (dataset.field("timestamp") <= end) & (
+                (dataset.field("year") < year)
+                | ((dataset.field("year") == year) & (dataset.field("month") <= month))
+            )
+            condition = up_to_end if condition is None else condition & up_to_end
+        if columns is not None:
+            key_field = SERIES_KEY_FIELDS[type_name]
+            names = ["timestamp", *([key_field] if key_field else []), *columns]
+            columns = list(dict.fromkeys(names))
+        else:
+            columns = [
+                name for name in source.schema.names if name not in ("year", "month")
+            ]
+        table = source.to_table(columns=columns, filter=condition)
+        if table.num_rows == 0:
+            return {}
+        return {name: table.column(name).to_numpy() for name in table.column_names}
+
+    def read(
+        self,
+        type_names: list[str] | None = None,
+        start: float | None = None,
+        end: float | None = None,
+        columns: list[str] | None = None,
+    ) -> SeriesMap:
+        series = {}
+        for type_name in type_names if type_names is not None else self.type_names():
+            type_columns = self.read_columns(type_name, start, end, columns)
+            if len(type_columns) > 0:
+                series.update(split_series(type_name, type_columns))
+        return series
+
+    def read_rows(self) -> list[dict]:
+        rows = []
+        for type_name in self.type_names():
+            type_columns = self.read_columns(type_name)
+            names = list(type_columns)
+            for values in zip(*(type_columns[name].tolist() for name in names)):
+                rows.append({**dict(zip(names, values)), "type": type_name})
+        return rows
+
+
+def bulk_store() -> AggregateStore | None:
+    # None while the bulk aggregates still live in the JSON lines file
+    return AggregateStore() if BULK_ENGINE == "parquet" else None
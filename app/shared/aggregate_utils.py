@@ -1,6 +1,7 @@
-from datetime import datetime
-from typing import get_args
+from datetime import date, datetime
+from typing import Callable, get_args
 
+from app.shared.from_dict import get_decoder
 from app.shared.types import AggregateImpl, DataImpl, DataType
 
 AGGREGATE_MAPPING: dict[str, str] = {
@@ -8,14 +9,73 @@ AGGREGATE_MAPPING: dict[str, str] = {
     "NetworkData": "NetworkAggregatedData",
     "GpuData": "GpuAggregatedData",
     "UpsData": "UpsAggregatedData",
+    "LoggerData": "LoggerAggregatedData",
+    "CollectorData": "CollectorAggregatedData",
+}
+
+SERIES_KEY_FIELDS: dict[str, str | None] = {
+    "CpuData": None,
+    "NetworkData": "destination",
+    "GpuData": "uuid",
+    "UpsData": None,
+    "LoggerData": None,
+    "CollectorData": "collector",
+    "CpuAggregatedData": None,
+    "NetworkAggregatedData": "destination",
+    "GpuAggregatedData": "uuid",
+    "UpsAggregatedData": None,
+    "LoggerAggregatedData": None,
+    "CollectorAggregatedData": "collector",
+}
+
+DEFAULT_SERIES_KEY = "default"
+
+
+DATA_CLASSES: dict[str, DataImpl] = {cls.__name__: cls for cls in get_args(DataImpl)}
+
+AGGREGATE_CLASSES: dict[str, AggregateImpl] = {
+    cls.__name__: cls for cls in get_args(AggregateImpl)
+}
+
+DATA_DECODERS: dict[str, Callable[[dict], DataImpl]] = {
+    name: get_decoder(cls) for name, cls in DATA_CLASSES.items()  # type: ignore
+}
+
+AGGREGATE_DECODERS: dict[str, Callable[[dict], AggregateImpl]] = {
+    name: get_decoder(cls) for name, cls in AGGREGATE_CLASSES.items()  # type: ignore
 }
 
 
+def decode_data(data: dict) -> DataImpl:
+    decoder = DATA_DECODERS.get(data["type"])
+    if decoder is None:
+        raise ValueError(f"Unknown data type: {data['type']}")
+    return decoder(data)
+
+
+def decode_aggregate(data: dict) -> AggregateImpl:
+    decoder = AGGREGATE_DECODERS.get(data["type"])
+    if decoder is None:
+        raise ValueError(f"Unknown aggregate class: {data['type']}")
+    return decoder(data)
+
+
 def get_data_class(data: dict) -> DataImpl:
-    for cls in get_args(DataImpl):
-        if cls.__name__ == data["type"]:
-            return cls
-    raise ValueError(f"Unknown data type: {data['type']}")
+    return get_data_class_from_name(data["type"])
+
+
+def get_data_class_from_name(class_name: str) -> DataImpl:
+    cls = DATA_CLASSES.get(class_name)
+    if cls is None:
+        raise ValueError(f"Unknown data type: {class_name}")
+    return cls
+
+
+def get_series_key(row: DataImpl | AggregateImpl) -> str:
+    key_field = SERIES_KEY_FIELDS[row.__class__.__name__]
+    if key_field is None:
+        return DEFAULT_SERIES_KEY
+    return getattr(row, key_field)
 
 
 def get_aggregate_class(data: dict) -> AggregateImpl:
@@ -23,10 +83,10 @@ def get_aggregate_class(data: dict) -> AggregateImpl:
 
 
 def get_aggregate_class_from_name(class_name: str) -> AggregateImpl:
-    for cls in get_args(AggregateImpl):
-        if cls.__name__ == class_name:
-            return cls
-    raise ValueError(f"Unknown aggregate class: {class_name}")
+    cls = AGGREGATE_CLASSES.get(class_name)
+    if cls is None:
+        raise ValueError(f"Unknown aggregate class: {class_name}")
+    return cls
 
 
 def group_by_day(data: list[DataType]) -> list[list[DataType]]:
@@ -45,6 +105,14 @@ def group_by_day(data: list[DataType]) -> list[list[DataType]]:
     return grouped_data
 
 
+def group_by_date(data: list[DataType]) -> list[list[DataType]]:
+    # calendar days in local time, for files that hold whole days from the past
+    data_map: dict[date, list[DataType]] = {}
+    for row in data:
+        data_map.setdefault(date.fromtimestamp(row.timestamp), []).append(row)
+    return [data_map[day] for day in sorted(data_map)]
+
+
 def group_by_type(data: list[DataType]) -> dict[str, list[DataType]]:
     groups = {}
     for row in data:
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import numpy as np
+
+from app.shared.aggregate_utils import get_series_key
+from app.shared.column_store import ColumnSpec, column_specs
+
+SeriesKey = tuple[str, str]  # data type, series key
+
+
+def series_dtype(spec: ColumnSpec) -> np.dtype:
+    # strings are kept as python objects in memory, codes only exist on disk
+    return np.dtype(object) if spec.kind == "str" else spec.dtype
+
+
+def sort_columns(columns: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    timestamps = columns["timestamp"]
+    if np.all(timestamps[1:] >= timestamps[:-1]):
+        return columns
+    order = np.argsort(timestamps, kind="stable")
+    return {name: column[order] for name, column in columns.items()}
+
+
+class ColumnSeries:
+    """
+    Rows of one data type and key stored as one numpy array per field, kept sorted
+    by timestamp. Appends grow the arrays geometrically so that ingesting a day of
+    samples stays linear, and rows arriving out of order are merged into the tail.
+    """
+
+    def __init__(
+        self, data_class: type, columns: dict[str, np.ndarray] | None = None
+    ) -> None:
+        self.data_class = data_class
+        self.specs = column_specs(data_class)
+        if columns is None:
+            columns = {
+                spec.name: np.empty(0, dtype=series_dtype(spec)) for spec in self.specs
+            }
+        self.buffers = columns
+        self.length = len(columns["timestamp"])
+        self.shared = False  # a snapshot holds views of the buffers
+
+    @property
+    def type_name(self) -> str:
+        return self.data_class.__name__
+
+    @property
+    def capacity(self) -> int:
+        return len(self.buffers["timestamp"])
+
+    @property
+    def columns(self) -> dict[str, np.ndarray]:
+        return {name: buffer[: self.length] for name, buffer in self.buffers.items()}
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.buffers[name][: self.length]
+
+    def reserve(self, capacity: int) -> None:
+        if capacity <= self.capacity:
+            return
+        self.reallocate(capacity)
+
+    def reallocate(self, capacity: int) -> None:
+        for name, buffer in self.buffers.items():
+            grown = np.empty(capacity, dtype=buffer.dtype)
+            grown[: self.length] = buffer[: self.length]
+            self.buffers[name] = grown
+        self.shared = False
+
+    def extend(self, rows: list) -> None:
+        if len(rows) == 0:
+            return
+        self.extend_columns(
+            {
+                spec.name: np.array(
+                    [getattr(row, spec.name) for row in rows], dtype=series_dtype(spec)
+                )
+                for spec in self.specs
+            }
+        )
+
+    def extend_columns(self, columns: dict[str, np.ndarray]) -> None:
+        count = len(columns["timestamp"])
+        if count == 0:
+            return
+        columns = sort_columns(columns)
+        # rows older than the newest one stored are merged in from where they belong
+        start = self.length
+        if self.length > 0 and columns["timestamp"][0] < self["timestamp"][-1]:
+            start = int(
+                np.searchsorted(self["timestamp"], columns["timestamp"][0], "right")
+            )
+        if self.length + count > self.capacity:
+            self.reserve(max(2 * self.capacity, self.length + count))
+        elif start < self.length and self.shared:
+            self.reallocate(self.capacity)
+        end = self.length + count
+        if start == self.length:
+            for name, buffer in self.buffers.items():
+                buffer[self.length : end] = columns[name]
+        else:
+            order = np.argsort(
+                np.concatenate(
+                    [
+                        self.buffers["timestamp"][start : self.length],
+                        columns["timestamp"],
+                    ]
+                ),
+                kind="stable",
+            )
+            for name, buffer in self.buffers.items():
+                merged = np.concatenate([buffer[start : self.length], columns[name]])
+                buffer[start:end] = merged[order]
+        self.length = end
+
+    def view(self, start: int, end: int) -> ColumnSeries:
+        columns = {}
+        for name, buffer in self.buffers.items():
+            view = buffer[start:end]
+            view.flags.writeable = False
+            columns[name] = view
+        self.shared = True
+        return ColumnSeries(self.data_class, columns)
+
+    def snapshot(self) -> ColumnSeries:
+        """
+        Read-only views of the current rows. Later appends write past this length or
+        into reallocated buffers, so the snapshot never changes underneath a reader.
+        """
+        return self.view(0, self.length)
+
+    def window(self, start: float, end: float | None = None) -> ColumnSeries:
+        """
+        Read-only views of the rows with start < timestamp <= end, found by binary
+        search, so the cost depends on the rows returned rather than the series.
+        """
+        timestamps = self["timestamp"]
+        low = int(np.searchsorted(timestamps, start, "right"))
+        high = self.length
+        if end is not None:
+            high = int(np.searchsorted(timestamps, end, "right"))
+        return self.view(low, max(low, high))
+
+    @classmethod
+    def from_columns(
+        cls, data_class: type, columns: dict[str, np.ndarray]
+    ) -> ColumnSeries:
+        # columns read from disk are in write order, which is only nearly sorted
+        return cls(data_class, sort_columns(columns))
+
+    @classmethod
+    def concat(cls, data_class: type, series: list[ColumnSeries]) -> ColumnSeries:
+        non_empty = [part for part in series if len(part) > 0]
+        if len(non_empty) == 0:
+            return cls(data_class)
+        if len(non_empty) == 1:
+            return non_empty[0]
+        # parts read with only some columns limit the result to the columns they share
+        names = [
+            name
+            for name in non_empty[0].buffers
+            if all(name in part.buffers for part in non_empty)
+        ]
+        combined = cls(
+            data_class,
+            {name: np.empty(0, dtype=non_empty[0][name].dtype) for name in names},
+        )
+        combined.reserve(sum(len(part) for part in non_empty))
+        for part in non_empty:
+            combined.extend_columns(part.columns)
+        return combined
+
+
+SeriesMap = dict[SeriesKey, ColumnSeries]
+
+
+def group_into_series(rows: list, series: SeriesMap | None = None) -> SeriesMap:
+    series = series if series is not None else {}
+    grouped: dict[SeriesKey, list] = {}
+    for row in rows:
+        key = (row.__class__.__name__, get_series_key(row))
+        grouped.setdefault(key, []).append(row)
+    for key, group in grouped.items():
+        if key not in series:
+            series[key] = ColumnSeries(group[0].__class__)
+        series[key].extend(group)
+    return series
@@ -0,0 +1,208 @@
+import json
+import os
+from dataclasses import dataclass, fields
+from datetime import date, datetime
+from functools import cache
+from typing import BinaryIO, TextIO
+from urllib.parse import quote, unquote
+
+import numpy as np
+
+from app.shared.aggregate_utils import get_data_class_from_name, get_series_key
+from app.shared.constants import COLUMN_DATA
+from app.shared.types import DataImpl
+
+COLUMN_DTYPES: dict[str, np.dtype] = {
+    "float": np.dtype("<f8"),
+    "int": np.dtype("<i8"),
+    "str": np.dtype("<u4"),  # index into the column's vocabulary file
+}
+
+
+@dataclass(frozen=True)
+class ColumnSpec:
+    name: str
+    kind: str  # key of COLUMN_DTYPES
+
+    @property
+    def dtype(self) -> np.dtype:
+        return COLUMN_DTYPES[self.kind]
+
+    @property
+    def file_name(self) -> str:
+        return f"{self.name}.{self.dtype.str[1:]}"
+
+    @property
+    def vocab_name(self) -> str:
+        return f"{self.name}.vocab"
+
+
+@cache
+def column_specs(data_class: type) -> tuple[ColumnSpec, ...]:
+    # the type field is implied by the partition directory
+    return tuple(
+        ColumnSpec(field.name, str(field.type))
+        for field in fields(data_class)
+        if field.name != "type"
+    )
+
+
+def partition_path(root: str, day: date, type_name: str, key: str) -> str:
+    return os.path.join(root, day.isoformat(), type_name, quote(key, safe=""))
+
+
+def read_vocabulary(path: str) -> list[str]:
+    if not os.path.isfile(path):
+        return []
+    with open(path) as file:
+        return [json.loads(line) for line in file if line.endswith("\n")]
+
+
+def column_length(path: str, spec: ColumnSpec) -> int:
+    file_path = os.path.join(path, spec.file_name)
+    if not os.path.isfile(file_path):
+        return 0
+    return os.path.getsize(file_path) // spec.dtype.itemsize
+
+
+def partition_length(path: str, specs: tuple[ColumnSpec, ...]) -> int:
+    # a crash mid-batch can leave some columns longer than others
+    return min(column_length(path, spec) for spec in specs)
+
+
+class ColumnPartitionWriter:
+    def __init__(self, path: str, data_class: type) -> None:
+        self.path = path
+        self.specs = column_specs(data_class)
+        os.makedirs(self.path, exist_ok=True)
+        self.repair()
+        self.files: dict[str, BinaryIO] = {
+            spec.name: open(os.path.join(self.path, spec.file_name), "ab")
+            for spec in self.specs
+        }
+        self.vocabularies: dict[str, dict[str, int]] = {}
+        self.vocab_files: dict[str, TextIO] = {}
+        for spec in self.specs:
+            if spec.kind != "str":
+                continue
+            vocab_path = os.path.join(self.path, spec.vocab_name)
+            vocabulary = read_vocabulary(vocab_path)
+            self.vocabularies[spec.name] = {
+                value: index for index, value in enumerate(vocabulary)
+            }
+            self.vocab_files[spec.name] = open(vocab_path, "a")
+
+    def repair(self) -> None:
+        length = partition_length(self.path, self.specs)
+        for spec in self.specs:
+            with open(os.path.join(self.path, spec.file_name), "ab") as file:
+                if column_length(self.path, spec) != length:
+                    file.truncate(length * spec.dtype.itemsize)
+
+    def encode(self, name: str, value: str) -> int:
+        vocabulary = self.vocabularies[name]
+        index = vocabulary.get(value)
+        if index is None:
+            index = len(vocabulary)
+            vocabulary[value] = index
+            # vocabulary entries land on disk before any code that refers to them
+            self.vocab_files[name].write(json.dumps(value) + "\n")
+            self.vocab_files[name].flush()
+        return index
+
+    def append(self, rows: list[DataImpl]) -> None:
+        for spec in self.specs:
+            values = [getattr(row, spec.name) for row in rows]
+            if spec.kind == "str":
+                values = [self.encode(spec.name, value) for value in values]
+            array = np.asarray(values, dtype=spec.dtype)
+            self.files[spec.name].write(array.tobytes())
+
+    def flush(self) -> None:
+        for file in self.files.values():
+            file.flush()
+
+    def close(self) -> None:
+        for file in list(self.files.values()) + list(self.vocab_files.values()):
+            file.close()
+
+
+class ColumnStoreWriter:
+    def __init__(self, root: str = COLUMN_DATA) -> None:
+        self.root = root
+        self.partitions: dict[tuple[date, str, str], ColumnPartitionWriter] = {}
+
+    def append(self, rows: list[DataImpl]) -> None:
+        groups: dict[tuple[date, str, str], list[DataImpl]] = {}
+        for row in rows:
+            day = datetime.fromtimestamp(row.timestamp).date()
+            groups.setdefault(
+                (day, row.__class__.__name__, get_series_key(row)), []
+            ).append(row)
+        for partition_key, group in groups.items():
+            self.get_partition(*partition_key).append(group)
+        self.flush()
+
+    def get_partition(
+        self, day: date, type_name: str, key: str
+    ) -> ColumnPartitionWriter:
+        partition = self.partitions.get((day, type_name, key))
+        if partition is None:
+            self.close_before(day.toordinal() - 1)
+            partition = ColumnPartitionWriter(
+                partition_path(self.root, day, type_name, key),
+                get_data_class_from_name(type_name),
+            )
+            self.partitions[(day, type_name, key)] = partition
+        return partition
+
+    def close_before(self, ordinal: int) -> None:
+        # late samples from yesterday are still accepted, anything older is closed
+        for partition_key in list(self.partitions.keys()):
+            if partition_key[0].toordinal() < ordinal:
+                self.partitions.pop(partition_key).close()
+
+    def flush(self) -> None:
+        for partition in self.partitions.values():
+            partition.flush()
+
+    def close(self) -> None:
+        for partition in self.partitions.values():
+            partition.close()
+        self.partitions = {}
+
+
+class ColumnStoreReader:
+    def __init__(self, root: str = COLUMN_DATA) -> None:
+        self.root = root
+
+    def list_keys(self, day: date, type_name: str) -> list[str]:
+        type_path = os.path.join(self.root, day.isoformat(), type_name)
+        if not os.path.isdir(type_path):
+            return []
+        return sorted(unquote(name) for name in os.listdir(type_path))
+
+    def read(self, day: date, type_name: str, key: str) -> dict[str, np.ndarray]:
+        data_class = get_data_class_from_name(type_name)
+        specs = column_specs(data_class)
+        path = partition_path(self.root, day, type_name, key)
+        length = partition_length(path, specs) if os.path.isdir(path) else 0
+
+        columns: dict[str, np.ndarray] = {}
+        for spec in specs:
+            if length == 0:
+                column = np.empty(0, dtype=spec.dtype)
+            else:
+                column = np.memmap(
+                    os.path.join(path, spec.file_name),
+                    dtype=spec.dtype,
+                    mode="r",
+                    shape=(length,),
+                )
+            if spec.kind == "str":
+                vocabulary = np.array(
+                    read_vocabulary(os.path.join(path, spec.vocab_name)), dtype=object
+                )
+                column = vocabulary[column] if length > 0 else vocabulary[:0]
+            columns[spec.name] = column
+        return columns
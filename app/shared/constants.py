@@ -1,3 +1,23 @@
 TODAYS_DATA = "data/data.jsonl"
 YESTERDAYS_DATA = "data/data.jsonl.bak"
 BULK_DATA = "data/bulk_data.jsonl"
+AGGREGATE_CHECKPOINT = "data/aggregates.checkpoint.json"
+ROLLUP_DATA = {
+    "1m": "data/rollup_1m.jsonl",
+    "15m": "data/rollup_15m.jsonl",
+    "1h": "data/rollup_1h.jsonl",
+}
+ROLLUP_RETENTION_DAYS = {"1m": 7, "15m": 90, "1h": 730}  # kept in each tier file
+ROLLUP_CHECKPOINT = "data/rollups.checkpoint.json"
+DROP_COUNTS = "data/drops.json"
+COLUMN_DATA = "data/columns"
+SEGMENT_DATA = "data/segments"
+ARCHIVE_DATA = "data/archive"
+ARCHIVE_RETENTION_DAYS = 365  # compressed raw days kept before deletion
+AGGREGATE_STORE = "data/aggregates"
+
+LOGGER_CONFIG = "logger_config.json"
+STORAGE_ENGINE = "jsonl"  # "jsonl" or "columns"
+BULK_ENGINE = "jsonl"  # "jsonl" or "parquet", run migrate_bulk_data.py first
+QUERY_SERVICE_HOST = "127.0.0.1"  # only local tools may query the hot data
+QUERY_SERVICE_PORT = 8765
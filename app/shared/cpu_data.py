@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 from dataclasses import asdict, dataclass
-from typing import Literal
-
-import numpy as np
+from typing import TYPE_CHECKING, Literal
 
 from app.shared.from_dict import from_dict
 
+if TYPE_CHECKING:
+    from app.shared.online_aggregator import SampleSummary
+
 
 @dataclass
 class CpuData:
@@ -40,39 +41,19 @@ class CpuAggregatedData:
     type: Literal["CpuAggregatedData"] = "CpuAggregatedData"
 
     @classmethod
-    def from_collection(cls, data: list[CpuData]) -> CpuAggregatedData:
-        timestamps = np.array([x.timestamp for x in data])
-        utilization = np.array([x.utilization for x in data])
-        memory_used = np.array([x.memory_used for x in data])
-        memory_free = np.array([x.memory_free for x in data])
-        temperature = np.array([x.temperature for x in data])
-
-        peak_utilization = float(np.max(utilization))
-        peak_memory_used = float(np.max(memory_used))
-        peak_memory_free = float(np.max(memory_free))
-        peak_temperature = float(np.max(temperature))
-
-        average_utilization = float(np.mean(utilization))
-        average_memory_used = float(np.mean(memory_used))
-        average_memory_free = float(np.mean(memory_free))
-        average_temperature = float(np.mean(temperature))
-
-        start_time = float(np.min(timestamps))
-        end_time = float(np.max(timestamps))
-
-        time_span = end_time - start_time
-
+    def from_summary(cls, summary: SampleSummary) -> CpuAggregatedData:
+        fields = summary.fields
         return CpuAggregatedData(
-            timestamp=end_time,
-            peak_utilization=peak_utilization,
-            peak_memory_used=peak_memory_used,
-            peak_memory_free=peak_memory_free,
-            peak_temperature=peak_temperature,
-            average_utilization=average_utilization,
-            average_memory_used=average_memory_used,
-            average_memory_free=average_memory_free,
-            average_temperature=average_temperature,
-            time_span=time_span,
+            timestamp=summary.end_time,
+            time_span=summary.time_span,
+            peak_utilization=fields["utilization"].peak,
+            peak_memory_used=fields["memory_used"].peak,
+            peak_memory_free=fields["memory_free"].peak,
+            peak_temperature=fields["temperature"].peak,
+            average_utilization=fields["utilization"].mean,
+            average_memory_used=fields["memory_used"].mean,
+            average_memory_free=fields["memory_free"].mean,
+            average_temperature=fields["temperature"].mean,
         )
 
     def to_dict(self) -> dict:
@@ -0,0 +1,72 @@
+import numpy as np
+
+
+def split_segments(y: np.ndarray) -> tuple[list[np.ndarray], np.ndarray]:
+    """
+    Splits indices into runs of finite values, and the first and last index of each
+    run of NaNs. Keeping those NaN edges keeps gaps visible after downsampling.
+    """
+    is_nan = np.isnan(y)
+    edges = np.flatnonzero(np.diff(is_nan.astype(np.int8))) + 1
+    runs = np.split(np.arange(len(y)), edges)
+    segments = [run for run in runs if len(run) > 0 and not is_nan[run[0]]]
+    nan_edges = [
+        np.unique(run[[0, -1]]) for run in runs if len(run) > 0 and is_nan[run[0]]
+    ]
+    nan_indices = np.concatenate(nan_edges) if nan_edges else np.empty(0, dtype=int)
+    return segments, nan_indices
+
+
+def min_max_indices(y: np.ndarray, num_points: int) -> np.ndarray:
+    """Keeps the lowest and highest value of each bucket. Returns selected indices."""
+    length = len(y)
+    num_buckets = num_points // 2
+    if num_buckets < 1 or length <= num_points:
+        return np.arange(length)
+    bucket_edges = np.linspace(0, length, num_buckets + 1).astype(int)
+    selected = [0, length - 1]
+    for start, end in zip(bucket_edges[:-1], bucket_edges[1:]):
+        if end <= start:
+            continue
+        bucket = y[start:end]
+        selected.append(start + int(np.argmin(bucket)))
+        selected.append(start + int(np.argmax(bucket)))
+    return np.unique(selected)
+
+
+def gap_bucket_indices(y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    For series with more gaps than points to spare. Each bucket keeps its lowest and
+    highest finite value and one NaN if it has any, so gaps merge per bucket.
+    """
+    length = len(y)
+    num_buckets = max(1, max_points // 3)
+    bucket_edges = np.linspace(0, length, num_buckets + 1).astype(int)
+    is_nan = np.isnan(y)
+    selected = [0, length - 1]
+    for start, end in zip(bucket_edges[:-1], bucket_edges[1:]):
+        if end <= start:
+            continue
+        nan_positions = np.flatnonzero(is_nan[start:end])
+        if len(nan_positions) > 0:
+            selected.append(start + int(nan_positions[0]))
+        if len(nan_positions) < end - start:
+            bucket = y[start:end]
+            selected.append(start + int(np.nanargmin(bucket)))
+            selected.append(start + int(np.nanargmax(bucket)))
+    return np.unique(selected)
+
+
+def downsample_indices(y: np.ndarray, max_points: int) -> np.ndarray:
+    if len(y) <= max_points:
+        return np.arange(len(y))
+    segments, nan_indices = split_segments(y)
+    if len(nan_indices) + 2 * len(segments) > max_points:
+        return gap_bucket_indices(y, max_points)
+    budget = max_points - len(nan_indices)
+    num_finite = sum(len(segment) for segment in segments)
+    selected = [nan_indices]
+    for segment in segments:
+        num_points = max(2, budget * len(segment) // max(num_finite, 1))
+        selected.append(segment[min_max_indices(y[segment], num_points)])
+    return np.unique(np.concatenate(selected))
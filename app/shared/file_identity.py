@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import time
+from dataclasses import dataclass
+
+RACY_WINDOW_NS = 2_000_000_000  # coarse filesystem timestamps, in nanoseconds
+FINGERPRINT_BLOCK = 64 * 1024  # in bytes
+
+
+@dataclass(frozen=True)
+class FileIdentity:
+    inode: int = 0
+    size: int = 0
+    mtime_ns: int = 0
+    fingerprint: str = ""  # only computed while the mtime is too recent to trust
+
+    def matches(self, other: FileIdentity) -> bool:
+        if (self.inode, self.size, self.mtime_ns) != (
+            other.inode,
+            other.size,
+            other.mtime_ns,
+        ):
+            return False
+        if self.fingerprint and other.fingerprint:
+            return self.fingerprint == other.fingerprint
+        return True
+
+
+def fingerprint(path: str, size: int) -> str:
+    # the head catches rewrites of a file, the tail catches appends
+    hash_md5 = hashlib.md5()
+    with open(path, "rb") as file:
+        hash_md5.update(file.read(FINGERPRINT_BLOCK))
+        if size > FINGERPRINT_BLOCK:
+            file.seek(max(FINGERPRINT_BLOCK, size - FINGERPRINT_BLOCK))
+            hash_md5.update(file.read(FINGERPRINT_BLOCK))
+    return hash_md5.hexdigest()
+
+
+def file_identity(path: str) -> FileIdentity:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return FileIdentity()
+    # a write landing in the same mtime tick as the last stat wouldn't show up,
+    # so fall back to looking at the contents until the file has settled
+    racy = time.time_ns() - stat.st_mtime_ns < RACY_WINDOW_NS
+    return FileIdentity(
+        inode=stat.st_ino,
+        size=stat.st_size,
+        mtime_ns=stat.st_mtime_ns,
+        fingerprint=fingerprint(path, stat.st_size) if racy else "",
+    )
@@ -1,11 +1,96 @@
+from dataclasses import MISSING, fields
 from enum import Enum
-from typing import Type, TypeVar
+from typing import (
+    Any,
+    Callable,
+    Literal,
+    Type,
+    TypeVar,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
 
-from dacite import Config
+from dacite import Config, MissingValueError, WrongTypeError
 from dacite import from_dict as from_dict_dacite
 
 T = TypeVar("T")
 
+Decoder = Callable[[dict], Any]
+
+DECODERS: dict[type, Decoder] = {}
+
+# conditions under which a value doesn't fit the field, bool is a subclass of int
+TYPE_CHECKS: dict[type, str] = {
+    float: "isinstance(value, bool) or not isinstance(value, (int, float))",
+    int: "isinstance(value, bool) or not isinstance(value, int)",
+    str: "not isinstance(value, str)",
+    bool: "not isinstance(value, bool)",
+}
+
 
 def from_dict(cls: Type[T], data: dict) -> T:
-    return from_dict_dacite(data_class=cls, data=data, config=Config(cast=[Enum]))
+    return get_decoder(cls)(data)
+
+
+def get_decoder(cls: Type[T]) -> Callable[[dict], T]:
+    decoder = DECODERS.get(cls)
+    if decoder is None:
+        decoder = compile_decoder(cls)
+        DECODERS[cls] = decoder
+    return decoder
+
+
+def dacite_decoder(cls: Type[T]) -> Callable[[dict], T]:
+    config = Config(cast=[Enum])
+    return lambda data: from_dict_dacite(data_class=cls, data=data, config=config)
+
+
+def compile_decoder(cls: Type[T]) -> Callable[[dict], T]:
+    """
+    Builds a constructor specialized for a flat dataclass of primitive and Literal
+    fields. Anything else (nested dataclasses, containers, enums) goes through dacite.
+    """
+    hints = get_type_hints(cls)
+    namespace: dict[str, Any] = {
+        "cls": cls,
+        "MISSING": MISSING,
+        "MissingValueError": MissingValueError,
+        "WrongTypeError": WrongTypeError,
+    }
+    lines = ["def decode(data):"]
+    names = []
+    for index, field in enumerate(fields(cls)):
+        if not field.init:
+            return dacite_decoder(cls)
+        hint = hints[field.name]
+        namespace[f"hint_{index}"] = hint
+        if get_origin(hint) is Literal:
+            namespace[f"allowed_{index}"] = frozenset(get_args(hint))
+            check = f"value not in allowed_{index}"
+        elif hint in TYPE_CHECKS:
+            check = TYPE_CHECKS[hint]
+        else:
+            return dacite_decoder(cls)
+
+        lines.append(f"    value = data.get({field.name!r}, MISSING)")
+        lines.append("    if value is MISSING:")
+        if field.default is not MISSING:
+            namespace[f"default_{index}"] = field.default
+            lines.append(f"        value = default_{index}")
+        elif field.default_factory is not MISSING:
+            namespace[f"factory_{index}"] = field.default_factory
+            lines.append(f"        value = factory_{index}()")
+        else:
+            lines.append(f"        raise MissingValueError({field.name!r})")
+        lines.append(f"    elif {check}:")
+        lines.append(
+            f"        raise WrongTypeError("
+            f"field_path={field.name!r}, field_type=hint_{index}, value=value)"
+        )
+        lines.append(f"    field_{index} = value")
+        names.append(f"field_{index}")
+    lines.append(f"    return cls({', '.join(names)})")
+
+    exec("\n".join(lines), namespace)
+    return namespace["decode"]
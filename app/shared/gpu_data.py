@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 from dataclasses import asdict, dataclass
-from typing import Literal
-
-import numpy as np
+from typing import TYPE_CHECKING, Literal
 
 from app.shared.from_dict import from_dict
 
+if TYPE_CHECKING:
+    from app.shared.online_aggregator import SampleSummary
+
 
 @dataclass
 class GpuData:
@@ -52,52 +53,26 @@ class GpuAggregatedData:
     type: Literal["GpuAggregatedData"] = "GpuAggregatedData"
 
     @classmethod
-    def from_collection(cls, data: list[GpuData]) -> GpuAggregatedData:
-        # assumes all the same GPU
-        assert all(x.uuid == data[0].uuid for x in data)
-        timestamps = np.array([x.timestamp for x in data])
-        utilization_gpu = np.array([x.utilization_gpu for x in data])
-        utilization_memory = np.array([x.utilization_memory for x in data])
-        memory_free = np.array([x.memory_free for x in data])
-        memory_used = np.array([x.memory_used for x in data])
-        temperature_gpu = np.array([x.temperature_gpu for x in data])
-        power_draw = np.array([x.power_draw for x in data])
-
-        peak_utilization_gpu = float(np.max(utilization_gpu))
-        peak_utilization_memory = float(np.max(utilization_memory))
-        peak_memory_free = int(np.min(memory_free))
-        peak_memory_used = int(np.max(memory_used))
-        peak_temperature_gpu = float(np.max(temperature_gpu))
-        peak_power_draw = float(np.max(power_draw))
-
-        average_utilization_gpu = float(np.mean(utilization_gpu))
-        average_utilization_memory = float(np.mean(utilization_memory))
-        average_memory_free = int(np.mean(memory_free))
-        average_memory_used = int(np.mean(memory_used))
-        average_temperature_gpu = float(np.mean(temperature_gpu))
-        average_power_draw = float(np.mean(power_draw))
-
-        start_time = float(np.min(timestamps))
-        end_time = float(np.max(timestamps))
-
+    def from_summary(cls, summary: SampleSummary) -> GpuAggregatedData:
+        fields = summary.fields
         return GpuAggregatedData(
-            timestamp=end_time,
-            time_span=end_time - start_time,
-            name=data[0].name,
-            serial=data[0].serial,
-            uuid=data[0].uuid,
-            peak_utilization_gpu=peak_utilization_gpu,
-            peak_utilization_memory=peak_utilization_memory,
-            peak_memory_free=peak_memory_free,
-            peak_memory_used=peak_memory_used,
-            peak_temperature_gpu=peak_temperature_gpu,
-            peak_power_draw=peak_power_draw,
-            average_utilization_gpu=average_utilization_gpu,
-            average_utilization_memory=average_utilization_memory,
-            average_memory_free=average_memory_free,
-            average_memory_used=average_memory_used,
-            average_temperature_gpu=average_temperature_gpu,
-            average_power_draw=average_power_draw,
+            timestamp=summary.end_time,
+            time_span=summary.time_span,
+            name=summary.label("name"),
+            serial=summary.label("serial"),
+            uuid=summary.label("uuid"),
+            peak_utilization_gpu=fields["utilization_gpu"].peak,
+            peak_utilization_memory=fields["utilization_memory"].peak,
+            peak_memory_free=int(fields["memory_free"].low),
+            peak_memory_used=int(fields["memory_used"].peak),
+            peak_temperature_gpu=fields["temperature_gpu"].peak,
+            peak_power_draw=fields["power_draw"].peak,
+            average_utilization_gpu=fields["utilization_gpu"].mean,
+            average_utilization_memory=fields["utilization_memory"].mean,
+            average_memory_free=int(fields["memory_free"].mean),
+            average_memory_used=int(fields["memory_used"].mean),
+            average_temperature_gpu=fields["temperature_gpu"].mean,
+            average_power_draw=fields["power_draw"].mean,
         )
 
     def to_dict(self) -> dict:
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Literal
+
+from app.shared.from_dict import from_dict
+
+if TYPE_CHECKING:
+    from app.shared.online_aggregator import SampleSummary
+
+
+@dataclass
+class LoggerData:
+    timestamp: float = 0.0
+    queue_depth: int = 0  # rows waiting to be written
+    loop_lag_ms: float = 0.0  # worst event loop wake up delay, in milliseconds
+    rows_per_second: float = 0.0  # written since the last record
+    write_latency_ms: float = 0.0  # average batch write, in milliseconds
+    collector_ms: float = 0.0  # slowest collector call, in milliseconds
+    slowest_collector: str = ""
+    dropped_rows: int = 0  # by the full data queue since the last record
+    type: Literal["LoggerData"] = "LoggerData"
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> LoggerData:
+        return from_dict(cls, data)
+
+
+@dataclass
+class LoggerAggregatedData:
+    timestamp: float = 0.0
+    time_span: float = 0.0  # in seconds
+    peak_queue_depth: float = 0.0
+    peak_loop_lag_ms: float = 0.0
+    peak_rows_per_second: float = 0.0
+    peak_write_latency_ms: float = 0.0
+    peak_collector_ms: float = 0.0
+    average_queue_depth: float = 0.0
+    average_loop_lag_ms: float = 0.0
+    average_rows_per_second: float = 0.0
+    average_write_latency_ms: float = 0.0
+    average_collector_ms: float = 0.0
+    dropped_rows: float = 0.0  # in total over the time span
+    type: Literal["LoggerAggregatedData"] = "LoggerAggregatedData"
+
+    @classmethod
+    def from_summary(cls, summary: SampleSummary) -> LoggerAggregatedData:
+        fields = summary.fields
+        return LoggerAggregatedData(
+            timestamp=summary.end_time,
+            time_span=summary.time_span,
+            peak_queue_depth=fields["queue_depth"].peak,
+            peak_loop_lag_ms=fields["loop_lag_ms"].peak,
+            peak_rows_per_second=fields["rows_per_second"].peak,
+            peak_write_latency_ms=fields["write_latency_ms"].peak,
+            peak_collector_ms=fields["collector_ms"].peak,
+            average_queue_depth=fields["queue_depth"].mean,
+            average_loop_lag_ms=fields["loop_lag_ms"].mean,
+            average_rows_per_second=fields["rows_per_second"].mean,
+            average_write_latency_ms=fields["write_latency_ms"].mean,
+            average_collector_ms=fields["collector_ms"].mean,
+            dropped_rows=fields["dropped_rows"].total,
+        )
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> LoggerAggregatedData:
+        return from_dict(cls, data)
+
+
+@dataclass
+class CollectorData:
+    timestamp: float = 0.0
+    collector: str = ""
+    duration_ms: float = 0.0  # slowest call since the last record, in milliseconds
+    type: Literal["CollectorData"] = "CollectorData"
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> CollectorData:
+        return from_dict(cls, data)
+
+
+@dataclass
+class CollectorAggregatedData:
+    timestamp: float = 0.0
+    time_span: float = 0.0  # in seconds
+    collector: str = ""
+    peak_duration_ms: float = 0.0
+    average_duration_ms: float = 0.0
+    type: Literal["CollectorAggregatedData"] = "CollectorAggregatedData"
+
+    @classmethod
+    def from_summary(cls, summary: SampleSummary) -> CollectorAggregatedData:
+        duration = summary.fields["duration_ms"]
+        return CollectorAggregatedData(
+            timestamp=summary.end_time,
+            time_span=summary.time_span,
+            collector=summary.label("collector"),
+            peak_duration_ms=duration.peak,
+            average_duration_ms=duration.mean,
+        )
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> CollectorAggregatedData:
+        return from_dict(cls, data)
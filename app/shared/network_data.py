@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 from dataclasses import asdict, dataclass
-from typing import Literal
-
-import numpy as np
+from typing import TYPE_CHECKING, Literal
 
 from app.shared.from_dict import from_dict
 
+if TYPE_CHECKING:
+    from app.shared.online_aggregator import SampleSummary
+
 
 @dataclass
 class NetworkData:
@@ -35,25 +36,18 @@ class NetworkAggregatedData:
     type: Literal["NetworkAggregatedData"] = "NetworkAggregatedData"
 
     @classmethod
-    def from_collection(cls, data: list[NetworkData]) -> NetworkAggregatedData:
-        # assumes all the same destination
-        assert all(x.destination == data[0].destination for x in data)
-        timestamps = np.array([x.timestamp for x in data])
-        peak_ping = max(data, key=lambda x: x.ping_ms).ping_ms
-        num_misses = int(np.isnan([x.ping_ms for x in data]).sum())
-        num_pings = len(data)
-        num_hits = num_pings - num_misses
-        percent_packet_loss = num_misses / num_hits * 100
-        start_time = min(data, key=lambda x: x.timestamp).timestamp
-
-        start_time = float(np.min(timestamps))
-        end_time = float(np.max(timestamps))
+    def from_summary(cls, summary: SampleSummary) -> NetworkAggregatedData:
+        ping = summary.fields["ping_ms"]
+        num_pings = summary.count
+        num_hits = ping.count
+        num_misses = num_pings - num_hits
+        percent_packet_loss = num_misses / num_hits * 100 if num_hits > 0 else 100.0
 
         return NetworkAggregatedData(
-            timestamp=end_time,
-            time_span=end_time - start_time,
-            destination=data[0].destination,
-            peak_ping=peak_ping,
+            timestamp=summary.end_time,
+            time_span=summary.time_span,
+            destination=summary.label("destination"),
+            peak_ping=ping.peak,
             percent_packet_loss=percent_packet_loss,
             num_pings=num_pings,
             num_hits=num_hits,
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+from dataclasses import asdict, dataclass, field
+from datetime import date
+
+from app.shared.aggregate_utils import (
+    AGGREGATE_MAPPING,
+    get_aggregate_class_from_name,
+    get_data_class_from_name,
+    get_series_key,
+)
+from app.shared.column_store import column_specs
+from app.shared.from_dict import from_dict
+from app.shared.types import AggregateImpl, DataImpl
+
+
+@dataclass
+class FieldSummary:
+    count: int = 0  # number of non-NaN values
+    nan_count: int = 0
+    total: float = 0.0
+    minimum: float = math.inf
+    maximum: float = -math.inf
+
+    @property
+    def mean(self) -> float:
+        if self.count == 0:
+            return math.nan
+        return self.total / self.count
+
+    @property
+    def peak(self) -> float:
+        return self.maximum if self.count > 0 else math.nan
+
+    @property
+    def low(self) -> float:
+        return self.minimum if self.count > 0 else math.nan
+
+    def add(self, value: float) -> None:
+        if math.isnan(value):
+            self.nan_count += 1
+            return
+        self.count += 1
+        self.total += value
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+    def merge(self, other: FieldSummary) -> None:
+        self.count += other.count
+        self.nan_count += other.nan_count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+
+@dataclass
+class SampleSummary:
+    type: str = ""  # name of the summarized data class
+    key: str = ""
+    count: int = 0
+    start_time: float = math.inf
+    end_time: float = -math.inf
+    fields: dict[str, FieldSummary] = field(default_factory=dict)
+    labels: dict[str, dict[str, int]] = field(default_factory=dict)  # str field counts
+
+    @classmethod
+    def for_row(cls, row: DataImpl) -> SampleSummary:
+        summary = cls(type=row.__class__.__name__, key=get_series_key(row))
+        for spec in column_specs(row.__class__):
+            if spec.name == "timestamp":
+                continue
+            if spec.kind == "str":
+                summary.labels[spec.name] = {}
+            else:
+                summary.fields[spec.name] = FieldSummary()
+        return summary
+
+    def add(self, row: DataImpl) -> None:
+        self.count += 1
+        self.start_time = min(self.start_time, row.timestamp)
+        self.end_time = max(self.end_time, row.timestamp)
+        for name, field_summary in self.fields.items():
+            field_summary.add(float(getattr(row, name)))
+        for name, counts in self.labels.items():
+            value = getattr(row, name)
+            counts[value] = counts.get(value, 0) + 1
+
+    def merge(self, other: SampleSummary) -> None:
+        self.count += other.count
+        self.start_time = min(self.start_time, other.start_time)
+        self.end_time = max(self.end_time, other.end_time)
+        for name, field_summary in other.fields.items():
+            self.fields.setdefault(name, FieldSummary()).merge(field_summary)
+        for name, counts in other.labels.items():
+            merged = self.labels.setdefault(name, {})
+            for value, count in counts.items():
+                merged[value] = merged.get(value, 0) + count
+
+    def label(self, name: str) -> str:
+        # most common value, for fields that are constant per key like serial numbers
+        counts = self.labels.get(name, {})
+        if len(counts) == 0:
+            return ""
+        return max(counts.items(), key=lambda item: item[1])[0]
+
+    @property
+    def time_span(self) -> float:
+        return self.end_time - self.start_time
+
+    def to_aggregate(self) -> AggregateImpl:
+        aggregate_cls = get_aggregate_class_from_name(AGGREGATE_MAPPING[self.type])
+        return aggregate_cls.from_summary(self)  # type: ignore
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> SampleSummary:
+        return from_dict(cls, data)
+
+
+class OnlineAggregator:
+    def __init__(self, day: date | None = None) -> None:
+        self.day = day if day is not None else date.today()
+        self.summaries: dict[tuple[str, str], SampleSummary] = {}
+
+    def add(self, row: DataImpl) -> None:
+        key = (row.__class__.__name__, get_series_key(row))
+        summary = self.summaries.get(key)
+        if summary is None:
+            summary = SampleSummary.for_row(row)
+            self.summaries[key] = summary
+        summary.add(row)
+
+    def snapshot(self) -> list[AggregateImpl]:
+        return [
+            summary.to_aggregate()
+            for summary in self.summaries.values()
+            if summary.count > 0
+        ]
+
+    def flush(self) -> list[AggregateImpl]:
+        aggregates = self.snapshot()
+        self.summaries = {}
+        self.day = date.today()
+        return aggregates
+
+    def checkpoint(self, path: str) -> None:
+        data = {
+            "day": self.day.isoformat(),
+            "summaries": [summary.to_dict() for summary in self.summaries.values()],
+        }
+        temp_path = path + ".tmp"
+        with open(temp_path, "w") as file:
+            json.dump(data, file)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def from_checkpoint(cls, path: str) -> OnlineAggregator:
+        if not os.path.isfile(path):
+            return cls()
+        try:
+            with open(path) as file:
+                data = json.load(file)
+        except (OSError, json.JSONDecodeError) as e:
+            logging.getLogger("data_logger").error(f"Failed to load {path}: {e}")
+            return cls()
+        aggregator = cls(date.fromisoformat(data["day"]))
+        for summary_dict in data["summaries"]:
+            summary = SampleSummary.from_dict(summary_dict)
+            get_data_class_from_name(summary.type)  # reject unknown types early
+            aggregator.summaries[(summary.type, summary.key)] = summary
+        return aggregator
+
+
+def read_partial_aggregates(path: str) -> list[AggregateImpl]:
+    if not os.path.isfile(path):
+        return []
+    return OnlineAggregator.from_checkpoint(path).snapshot()
@@ -1,11 +1,54 @@
 import json
-from typing import Generator
+from typing import BinaryIO, Generator, Iterator
 
+CHUNK_SIZE = 1024 * 1024  # in bytes
 
-def read_json_lines(reader) -> Generator[dict, None, None]:
-    for line in reader.readlines():
+
+class JsonLinesReader:
+    """
+    Reads a JSON lines file in fixed size chunks. When following a file that is still
+    being appended to, an unterminated last line is held back instead of being parsed,
+    and offset only ever points just past the last complete record.
+    """
+
+    def __init__(
+        self, reader: BinaryIO, chunk_size: int = CHUNK_SIZE, follow: bool = False
+    ) -> None:
+        self.reader = reader
+        self.chunk_size = chunk_size
+        self.follow = follow
+        self.offset = reader.tell()
+
+    def __iter__(self) -> Iterator[dict]:
+        remainder = b""
+        while True:
+            chunk = self.reader.read(self.chunk_size)
+            if not chunk:
+                break
+            lines = (remainder + chunk).split(b"\n")
+            remainder = lines.pop()
+            for line in lines:
+                self.offset += len(line) + 1
+                row = self.parse(line)
+                if row is not None:
+                    yield row
+        if remainder and not self.follow:
+            self.offset += len(remainder)
+            row = self.parse(remainder)
+            if row is not None:
+                yield row
+
+    def parse(self, line: bytes) -> dict | None:
+        if not line.strip():
+            return None
         try:
-            yield json.loads(line)
+            return json.loads(line)
         except json.JSONDecodeError as e:
             print(f"Error reading line: {e}")
-            continue
+            return None
+
+
+def read_json_lines(
+    reader: BinaryIO, chunk_size: int = CHUNK_SIZE, follow: bool = False
+) -> Generator[dict, None, None]:
+    yield from JsonLinesReader(reader, chunk_size, follow)
@@ -0,0 +1,108 @@
+import gzip
+import logging
+import os
+import re
+import shutil
+from datetime import date, timedelta
+from typing import Generator
+
+from app.shared.constants import ARCHIVE_DATA, ARCHIVE_RETENTION_DAYS, SEGMENT_DATA
+from app.shared.read_json_lines import CHUNK_SIZE, read_json_lines
+from app.shared.segments import list_segments
+from app.shared.time_index import index_path
+
+ARCHIVE_PATTERN = re.compile(r"^data-(\d{4}-\d{2}-\d{2})\.jsonl\.gz$")
+
+
+def archive_path(day: date, directory: str = ARCHIVE_DATA) -> str:
+    return os.path.join(directory, f"data-{day.isoformat()}.jsonl.gz")
+
+
+def list_archive(directory: str = ARCHIVE_DATA) -> list[date]:
+    if not os.path.isdir(directory):
+        return []
+    days = []
+    for name in os.listdir(directory):
+        match = ARCHIVE_PATTERN.match(name)
+        if match is not None:
+            days.append(date.fromisoformat(match.group(1)))
+    return sorted(days)
+
+
+def compress_segment(segment: str, destination: str) -> None:
+    """
+    Streams segment into the gzip archive at destination and removes the segment.
+    A day rotated more than once is appended as another gzip member, which readers
+    decompress as one continuous stream.
+    """
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+    temp_path = destination + ".tmp"
+    if os.path.isfile(destination):
+        shutil.copyfile(destination, temp_path)
+    with open(segment, "rb") as source, gzip.open(temp_path, "ab") as target:
+        shutil.copyfileobj(source, target, CHUNK_SIZE)
+    os.replace(temp_path, destination)
+    os.remove(segment)
+    if os.path.isfile(index_path(segment)):
+        os.remove(index_path(segment))
+
+
+def archive_segments(
+    keep_raw: int = 1,
+    segment_directory: str = SEGMENT_DATA,
+    archive_directory: str = ARCHIVE_DATA,
+) -> list[date]:
+    """
+    Compresses every raw segment except the newest keep_raw ones, which stay
+    uncompressed so that the dashboard can seek into them with their time index.
+    """
+    logger = logging.getLogger("data_logger")
+    segments = list_segments(segment_directory)
+    to_archive = segments[: max(len(segments) - keep_raw, 0)]
+    for day, segment in to_archive:
+        compress_segment(segment, archive_path(day, archive_directory))
+        logger.info(f"Archived {segment} to {archive_path(day, archive_directory)}")
+    return sorted({day for day, _ in to_archive})
+
+
+def apply_retention(
+    today: date,
+    retention_days: int = ARCHIVE_RETENTION_DAYS,
+    directory: str = ARCHIVE_DATA,
+) -> list[date]:
+    logger = logging.getLogger("data_logger")
+    expired = [
+        day
+        for day in list_archive(directory)
+        if day < today - timedelta(days=retention_days)
+    ]
+    for day in expired:
+        os.remove(archive_path(day, directory))
+        logger.info(f"Removed {archive_path(day, directory)} past retention")
+    return expired
+
+
+def list_days(
+    segment_directory: str = SEGMENT_DATA, archive_directory: str = ARCHIVE_DATA
+) -> list[date]:
+    raw_days = {day for day, _ in list_segments(segment_directory)}
+    return sorted(raw_days | set(list_archive(archive_directory)))
+
+
+def read_day(
+    day: date,
+    segment_directory: str = SEGMENT_DATA,
+    archive_directory: str = ARCHIVE_DATA,
+) -> Generator[dict, None, None]:
+    """
+    Yields the raw rows logged on day, decompressing the archive chunk by chunk so
+    that a full day never has to sit uncompressed on disk or in memory.
+    """
+    path = archive_path(day, archive_directory)
+    if os.path.isfile(path):
+        with gzip.open(path, "rb") as file:
+            yield from read_json_lines(file)  # type: ignore
+    for segment_day, segment in list_segments(segment_directory):
+        if segment_day == day:
+            with open(segment, "rb") as file:
+                yield from read_json_lines(file)
@@ -0,0 +1,58 @@
+import os
+import re
+from datetime import date
+
+from app.shared.constants import SEGMENT_DATA, YESTERDAYS_DATA
+from app.shared.time_index import index_path
+
+SEGMENT_PATTERN = re.compile(r"^data-(\d{4}-\d{2}-\d{2})(?:\.(\d+))?\.jsonl$")
+
+
+def segment_path(day: date, directory: str = SEGMENT_DATA) -> str:
+    """
+    Returns a path for a new segment holding day's samples. A day that was already
+    rotated once (e.g. by a manual bulk) gets a numbered suffix.
+    """
+    path = os.path.join(directory, f"data-{day.isoformat()}.jsonl")
+    count = 1
+    while os.path.exists(path):
+        path = os.path.join(directory, f"data-{day.isoformat()}.{count}.jsonl")
+        count += 1
+    return path
+
+
+def list_segments(directory: str = SEGMENT_DATA) -> list[tuple[date, str]]:
+    if not os.path.isdir(directory):
+        return []
+    segments = []
+    for name in os.listdir(directory):
+        match = SEGMENT_PATTERN.match(name)
+        if match is None:
+            continue
+        order = int(match.group(2) or 0)
+        day = date.fromisoformat(match.group(1))
+        segments.append((day, order, os.path.join(directory, name)))
+    segments.sort()
+    return [(day, path) for day, _, path in segments]
+
+
+def latest_segment(directory: str = SEGMENT_DATA) -> str:
+    segments = list_segments(directory)
+    if len(segments) == 0:
+        # data rotated before segments existed
+        return YESTERDAYS_DATA
+    return segments[-1][1]
+
+
+def rotate_file(data_path: str, destination: str) -> None:
+    """
+    Atomically moves the active data file and its time index to destination. Appends
+    through a handle opened before the rename still land in the rotated segment.
+    """
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+    if os.path.isfile(data_path):
+        os.rename(data_path, destination)
+    else:
+        open(destination, "ab").close()
+    if os.path.isfile(index_path(data_path)):
+        os.rename(index_path(data_path), index_path(destination))
@@ -0,0 +1,75 @@
+import bisect
+import os
+from typing import TextIO
+
+
+def index_path(data_path: str) -> str:
+    return data_path + ".idx"
+
+
+def read_time_index(data_path: str) -> list[tuple[float, int]]:
+    path = index_path(data_path)
+    if not os.path.isfile(path):
+        return []
+    entries = []
+    with open(path) as file:
+        for line in file:
+            if not line.endswith("\n"):
+                break  # partially written entry
+            timestamp, offset = line.split()
+            entries.append((float(timestamp), int(offset)))
+    return entries
+
+
+def find_offset(data_path: str, start_time: float, slack: float = 10.0) -> int:
+    """
+    Returns a byte offset into data_path such that every row before it was written
+    before start_time. slack absorbs collectors whose clocks run ahead of ours.
+    """
+    entries = read_time_index(data_path)
+    if len(entries) == 0:
+        return 0
+    timestamps = [timestamp for timestamp, _ in entries]
+    position = bisect.bisect_right(timestamps, start_time - slack) - 1
+    if position < 0:
+        return 0
+    offset = entries[position][1]
+    if offset > os.path.getsize(data_path):
+        # stale index for a file that was truncated
+        return 0
+    return offset
+
+
+class TimeIndexWriter:
+    def __init__(self, data_path: str, interval: float) -> None:
+        self.path = index_path(data_path)
+        self.interval = interval
+        self.file: TextIO | None = None
+        entries = read_time_index(data_path)
+        self.last_timestamp, self.last_offset = entries[-1] if entries else (0.0, 0)
+
+    def open(self) -> None:
+        if self.file is None:
+            self.file = open(self.path, "a")
+
+    def close(self) -> None:
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def reset(self) -> None:
+        self.close()
+        self.last_timestamp, self.last_offset = 0.0, 0
+
+    def record(self, timestamp: float, offset: int) -> None:
+        if offset < self.last_offset:
+            # the data file was truncated underneath us
+            self.last_timestamp = 0.0
+        if timestamp - self.last_timestamp < self.interval:
+            return
+        self.open()
+        assert self.file is not None
+        self.file.write(f"{timestamp:.3f} {offset}\n")
+        self.file.flush()
+        self.last_timestamp = timestamp
+        self.last_offset = offset
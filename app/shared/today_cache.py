@@ -0,0 +1,91 @@
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Callable
+
+from app.shared.aggregate_utils import decode_data
+from app.shared.column_series import SeriesMap, group_into_series
+from app.shared.file_identity import file_identity
+from app.shared.read_json_lines import JsonLinesReader
+
+
+@dataclass(frozen=True)
+class TodayCacheState:
+    series: SeriesMap = field(default_factory=dict)  # read-only snapshots
+    start: int = 0
+    seek: int = 0
+    inode: int = 0  # of the day file the cached rows were read from
+
+
+class SharedTodayCache:
+    """
+    Incrementally parsed rows of the day file, shared by every dashboard session or
+    query service request. Whichever caller gets the lock ingests the new bytes and
+    publishes an immutable state. Callers that arrive mid refresh read the last
+    published state instead of parsing the same bytes again.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        logger_name: str = "frontend",
+        decode: Callable[[dict], object] = decode_data,
+    ) -> None:
+        self.path = path
+        self.logger_name = logger_name
+        # decode_aggregate for the rollup files, which are appended to the same way
+        self.decode = decode
+        self.lock = threading.Lock()
+        self.series: SeriesMap = {}  # growing buffers, only touched under the lock
+        self.state = TodayCacheState()
+
+    def invalidate(self) -> None:
+        with self.lock:
+            self.series = {}
+            self.state = TodayCacheState()
+
+    def load(self, offset: int) -> SeriesMap:
+        if not self.lock.acquire(blocking=False):
+            state = self.state
+            if state.inode != 0 and offset >= state.start:
+                # another caller is refreshing, serve what it published last
+                return state.series
+            self.lock.acquire()
+        try:
+            self.refresh(offset)
+            return self.state.series
+        finally:
+            self.lock.release()
+
+    def refresh(self, offset: int) -> None:
+        logger = logging.getLogger(self.logger_name)
+        state = self.state
+        identity = file_identity(self.path)
+        if offset < state.start:
+            logger.debug(f"Time range grew past cached data, reloading from {offset}")
+            state = TodayCacheState(start=offset, seek=offset, inode=identity.inode)
+            self.series = {}
+        if identity.inode != state.inode or identity.size < state.seek:
+            # the day file was rotated into a segment, cached offsets belong to that one
+            logger.debug(f"{self.path} was rotated, reloading from {offset}")
+            state = TodayCacheState(start=offset, seek=offset, inode=identity.inode)
+            self.series = {}
+        if not os.path.isfile(self.path):
+            self.state = state
+            return
+        with open(self.path, "rb") as file:
+            file.seek(state.seek)
+            data = []
+            # the logger may be halfway through a line, leave it for the next rerun
+            lines = JsonLinesReader(file, follow=True)
+            for data_dict in lines:
+                data.append(self.decode(data_dict))
+        group_into_series(data, self.series)
+        self.state = TodayCacheState(
+            series={key: series.snapshot() for key, series in self.series.items()},
+            start=state.start,
+            seek=lines.offset,
+            inode=state.inode,
+        )
+        logger.debug(f"Loaded {len(data)} rows from {self.path}. Seek: {lines.offset}")
@@ -2,6 +2,12 @@ from typing import TypeVar, Union
 
 from app.shared.cpu_data import CpuAggregatedData, CpuData
 from app.shared.gpu_data import GpuAggregatedData, GpuData
+from app.shared.logger_data import (
+    CollectorAggregatedData,
+    CollectorData,
+    LoggerAggregatedData,
+    LoggerData,
+)
 from app.shared.network_data import NetworkAggregatedData, NetworkData
 from app.shared.ups_data import UpsAggregatedData, UpsData
 
@@ -10,6 +16,8 @@ DataImpl = Union[
     NetworkData,
     GpuData,
     UpsData,
+    LoggerData,
+    CollectorData,
 ]
 
 AggregateImpl = Union[
@@ -17,6 +25,8 @@ AggregateImpl = Union[
     NetworkAggregatedData,
     GpuAggregatedData,
     UpsAggregatedData,
+    LoggerAggregatedData,
+    CollectorAggregatedData,
 ]
 
 DataType = TypeVar("DataType", bound=DataImpl)
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 from dataclasses import asdict, dataclass
-from typing import Literal
-
-import numpy as np
+from typing import TYPE_CHECKING, Literal
 
 from app.shared.from_dict import from_dict
 
+if TYPE_CHECKING:
+    from app.shared.online_aggregator import SampleSummary
+
 
 @dataclass
 class UpsData:
@@ -50,52 +51,26 @@ class UpsAggregatedData:
     type: Literal["UpsAggregatedData"] = "UpsAggregatedData"
 
     @classmethod
-    def from_collection(cls, data: list[UpsData]) -> UpsAggregatedData:
-        # assumes all the same UPS
-        timestamps = np.array([x.timestamp for x in data])
-        line_voltage = np.array([x.line_voltage for x in data])
-        load_percent = np.array([x.load_percent for x in data])
-        battery_voltage = np.array([x.battery_voltage for x in data])
-        battery_percent = np.array([x.battery_percent for x in data])
-        output_current = np.array([x.output_current for x in data])
-        output_voltage = np.array([x.output_voltage for x in data])
-
-        peak_line_voltage = float(np.max(line_voltage))
-        peak_load_percent = float(np.max(load_percent))
-        peak_battery_voltage = float(np.max(battery_voltage))
-        peak_battery_percent = float(np.max(battery_percent))
-        peak_output_current = float(np.max(output_current))
-        peak_output_voltage = float(np.max(output_voltage))
-
-        average_line_voltage = float(np.mean(line_voltage))
-        average_load_percent = float(np.mean(load_percent))
-        average_battery_voltage = float(np.mean(battery_voltage))
-        average_battery_percent = float(np.mean(battery_percent))
-        average_output_current = float(np.mean(output_current))
-        average_output_voltage = float(np.mean(output_voltage))
-
-        start_time = float(np.min(timestamps))
-        end_time = float(np.max(timestamps))
-
-        up_percentage = sum(x.status == "ONLINE" for x in data) / len(data) * 100
-
+    def from_summary(cls, summary: SampleSummary) -> UpsAggregatedData:
+        fields = summary.fields
+        num_online = summary.labels.get("status", {}).get("ONLINE", 0)
         return UpsAggregatedData(
-            timestamp=end_time,
-            time_span=end_time - start_time,
-            serial=data[0].serial,
-            up_percentage=up_percentage,
-            peak_line_voltage=peak_line_voltage,
-            peak_load_percent=peak_load_percent,
-            peak_battery_voltage=peak_battery_voltage,
-            peak_battery_percent=peak_battery_percent,
-            peak_output_current=peak_output_current,
-            peak_output_voltage=peak_output_voltage,
-            average_line_voltage=average_line_voltage,
-            average_load_percent=average_load_percent,
-            average_battery_voltage=average_battery_voltage,
-            average_battery_percent=average_battery_percent,
-            average_output_current=average_output_current,
-            average_output_voltage=average_output_voltage,
+            timestamp=summary.end_time,
+            time_span=summary.time_span,
+            serial=summary.label("serial"),
+            up_percentage=num_online / summary.count * 100,
+            peak_line_voltage=fields["line_voltage"].peak,
+            peak_load_percent=fields["load_percent"].peak,
+            peak_battery_voltage=fields["battery_voltage"].peak,
+            peak_battery_percent=fields["battery_percent"].peak,
+            peak_output_current=fields["output_current"].peak,
+            peak_output_voltage=fields["output_voltage"].peak,
+            average_line_voltage=fields["line_voltage"].mean,
+            average_load_percent=fields["load_percent"].mean,
+            average_battery_voltage=fields["battery_voltage"].mean,
+            average_battery_percent=fields["battery_percent"].mean,
+            average_output_current=fields["output_current"].mean,
+            average_output_voltage=fields["output_voltage"].mean,
         )
 
     def to_dict(self) -> dict:
@@ -0,0 +1,168 @@
+import argparse
+import gzip
+import heapq
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from typing import Iterable
+
+from app.data_logger.bulk_stats_logger import BulkStatsLogger
+from app.shared.aggregate_store import bulk_store
+from app.shared.aggregate_utils import (
+    DEFAULT_SERIES_KEY,
+    SERIES_KEY_FIELDS,
+    decode_aggregate,
+    decode_data,
+    group_by_date,
+)
+from app.shared.constants import BULK_DATA, TODAYS_DATA
+from app.shared.read_json_lines import read_json_lines
+from app.shared.segment_archive import list_days, read_day
+
+Source = date | str  # an archived day, or a raw JSON lines file (optionally gzipped)
+
+
+def read_source(source: Source) -> list:
+    if isinstance(source, date):
+        return [decode_data(data_dict) for data_dict in read_day(source)]
+    opener = gzip.open if source.endswith(".gz") else open
+    with opener(source, "rb") as file:
+        return [decode_data(data_dict) for data_dict in read_json_lines(file)]  # type: ignore
+
+
+def bulk_source(source: Source) -> tuple[int, list[dict]]:
+    # runs in a worker process, dicts pickle far cheaper than dataclasses
+    data = read_source(source)
+    # group_by_day counts days back from now, which splits old days at the current time
+    bulk_data = BulkStatsLogger(TODAYS_DATA, BULK_DATA).bulk(data, group_by_date)
+    check_one_row_per_day(bulk_data)
+    bulk_data.sort(key=lambda row: row.timestamp)
+    return len(data), [row.to_dict() for row in bulk_data]
+
+
+def check_one_row_per_day(bulk_data: list) -> None:
+    seen = set()
+    for row in bulk_data:
+        type_name = row.__class__.__name__
+        key_field = SERIES_KEY_FIELDS[type_name]
+        key = getattr(row, key_field) if key_field else DEFAULT_SERIES_KEY
+        day = date.fromtimestamp(row.timestamp)
+        if (type_name, key, day) in seen:
+            raise ValueError(f"More than one {type_name} for {key} on {day}")
+        seen.add((type_name, key, day))
+
+
+def drop_duplicate_days(
+    sources: list[Source], results: list[list[dict]]
+) -> list[list[dict]]:
+    # overlapping raw files would otherwise write two aggregates for the same day
+    first_source: dict[date, Source] = {}
+    kept = []
+    for source, bulk_data in zip(sources, results):
+        days = {date.fromtimestamp(row["timestamp"]) for row in bulk_data}
+        duplicates = days & first_source.keys()
+        for day in sorted(duplicates):
+            print(
+                f"Warning: {day} is in both {first_source[day]} and {source}, "
+                f"keeping the first."
+            )
+        kept.append(
+            [
+                row
+                for row in bulk_data
+                if date.fromtimestamp(row["timestamp"]) not in duplicates
+            ]
+        )
+        for day in days - duplicates:
+            first_source[day] = source
+    return kept
+
+
+def read_kept_rows(path: str, replaced_days: set[date]) -> list[dict]:
+    # history older than the raw archive only survives in the bulk file itself
+    if not os.path.isfile(path):
+        return []
+    with open(path, "rb") as file:
+        return [
+            data_dict
+            for data_dict in read_json_lines(file)
+            if date.fromtimestamp(data_dict["timestamp"]) not in replaced_days
+        ]
+
+
+def write_atomically(path: str, rows: Iterable[dict]) -> int:
+    temp_path = path + ".tmp"
+    count = 0
+    with open(temp_path, "w") as file:
+        for row in rows:
+            json.dump(row, file)
+            file.write("\n")
+            count += 1
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+    return count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild bulk data from raw data")
+    parser.add_argument("files", nargs="*", help="raw files to use instead of days")
+    parser.add_argument("--start", type=date.fromisoformat, default=date.min)
+    parser.add_argument("--end", type=date.fromisoformat, default=date.max)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--output", default=BULK_DATA)
+    args = parser.parse_args()
+
+    sources: list[Source]
+    if args.files:
+        sources = list(args.files)
+    else:
+        sources = [day for day in list_days() if args.start <= day <= args.end]
+    if len(sources) == 0:
+        print("Nothing to backfill.")
+        return
+    print(f"Backfilling {len(sources)} sources with {args.workers} workers.")
+
+    start = time.perf_counter()
+    rows_read = 0
+    results = []
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        for num_rows, bulk_data in executor.map(bulk_source, sources):
+            rows_read += num_rows
+            results.append(bulk_data)
+    results = drop_duplicate_days(sources, results)
+    replaced_days = {
+        date.fromtimestamp(row["timestamp"])
+        for bulk_data in results
+        for row in bulk_data
+    }
+    replaced_days |= {source for source in sources if isinstance(source, date)}
+    store = bulk_store() if args.output == BULK_DATA else None
+    if store is not None:
+        args.output = store.root
+        kept_rows = [
+            data_dict
+            for data_dict in store.read_rows()
+            if date.fromtimestamp(data_dict["timestamp"]) not in replaced_days
+        ]
+    else:
+        kept_rows = read_kept_rows(args.output, replaced_days)
+    kept_rows.sort(key=lambda row: row["timestamp"])
+    merged = heapq.merge(kept_rows, *results, key=lambda row: row["timestamp"])
+    if store is not None:
+        num_written = store.rewrite(decode_aggregate(row) for row in merged)
+    else:
+        num_written = write_atomically(args.output, merged)
+    duration = time.perf_counter() - start
+
+    print(
+        f"Read {rows_read} rows in {duration:.1f} s ({rows_read / duration:,.0f} rows/s). "
+        f"Wrote {num_written} records to {args.output}, "
+        f"{len(kept_rows)} of them kept from days that were not rebuilt."
+    )
+
+
+if __name__ == "__main__":
+    main()
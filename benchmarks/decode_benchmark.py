@@ -0,0 +1,104 @@
+import argparse
+import json
+import math
+import random
+import time
+from enum import Enum
+from typing import Callable, get_args
+
+from dacite import Config
+from dacite import from_dict as from_dict_dacite
+
+from app.shared import CpuData, GpuData, NetworkData, UpsData
+from app.shared.aggregate_utils import decode_data
+from app.shared.types import DataImpl
+
+
+def synthetic_day(seconds: int, num_gpus: int, destinations: list[str]) -> list[dict]:
+    start = time.time() - seconds
+    rows = []
+    for second in range(seconds):
+        timestamp = start + second
+        rows.append(
+            CpuData(
+                timestamp=timestamp,
+                utilization=random.uniform(0, 100),
+                memory_free=random.uniform(0, 32000),
+                memory_used=random.uniform(0, 32000),
+                temperature=random.uniform(30, 90),
+            ).to_dict()
+        )
+        for index in range(num_gpus):
+            rows.append(
+                GpuData(
+                    timestamp=timestamp,
+                    name="NVIDIA GeForce RTX 3090",
+                    serial=f"13240{index}",
+                    uuid=f"GPU-{index:08d}",
+                    utilization_gpu=random.uniform(0, 100),
+                    utilization_memory=random.uniform(0, 100),
+                    memory_free=random.randint(0, 24000),
+                    memory_used=random.randint(0, 24000),
+                    temperature_gpu=random.uniform(30, 90),
+                    power_draw=random.uniform(20, 350),
+                ).to_dict()
+            )
+        for destination in destinations:
+            ping_ms = random.uniform(1, 30) if random.random() > 0.01 else math.nan
+            rows.append(
+                NetworkData(
+                    timestamp=timestamp, destination=destination, ping_ms=ping_ms
+                ).to_dict()
+            )
+        if second % 60 == 0:
+            rows.append(
+                UpsData(
+                    timestamp=timestamp,
+                    serial="3B1234X56789",
+                    line_voltage=120.0,
+                    status="ONLINE",
+                    load_percent=random.uniform(0, 100),
+                    battery_voltage=27.0,
+                    battery_percent=100.0,
+                    output_current=random.uniform(0, 10),
+                    output_voltage=120.0,
+                ).to_dict()
+            )
+    # decode what the dashboard would read back from disk
+    return [json.loads(json.dumps(row)) for row in rows]
+
+
+def legacy_decode(data: dict) -> DataImpl:
+    for cls in get_args(DataImpl):
+        if cls.__name__ == data["type"]:
+            return from_dict_dacite(
+                data_class=cls, data=data, config=Config(cast=[Enum])
+            )
+    raise ValueError(f"Unknown data type: {data['type']}")
+
+
+def measure(name: str, decode: Callable[[dict], DataImpl], rows: list[dict]) -> float:
+    start = time.perf_counter()
+    decoded = [decode(row) for row in rows]
+    duration = time.perf_counter() - start
+    rate = len(decoded) / duration
+    print(f"{name:>10}: {len(decoded)} rows in {duration:.3f} s ({rate:,.0f} rows/s)")
+    return rate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare row decoding throughput")
+    parser.add_argument("--seconds", type=int, default=24 * 3600)
+    parser.add_argument("--gpus", type=int, default=2)
+    args = parser.parse_args()
+
+    rows = synthetic_day(args.seconds, args.gpus, ["192.168.1.1", "www.google.com"])
+    assert all(legacy_decode(row) == decode_data(row) for row in rows[:1000])
+
+    legacy_rate = measure("dacite", legacy_decode, rows)
+    compiled_rate = measure("compiled", decode_data, rows)
+    print(f"Speedup: {compiled_rate / legacy_rate:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,24 @@
+from datetime import date
+
 from app.data_logger.bulk_stats_logger import BulkStatsLogger
-from app.shared.constants import BULK_DATA, TODAYS_DATA
+from app.shared.aggregate_store import bulk_store
+from app.shared.constants import AGGREGATE_CHECKPOINT, BULK_DATA, TODAYS_DATA
+from app.shared.online_aggregator import OnlineAggregator
+from app.shared.segments import segment_path
 
 
 def main() -> None:
-    bulk_stats_logger = BulkStatsLogger(TODAYS_DATA, BULK_DATA)
-    bulk_stats_logger.make_backup()
-    print("Made backup of data.")
-    data = bulk_stats_logger.read_data()
+    bulk_stats_logger = BulkStatsLogger(TODAYS_DATA, BULK_DATA, bulk_store())
+    segment = bulk_stats_logger.rotate(segment_path(date.today()))
+    print(f"Rotated data to {segment}.")
+    data = bulk_stats_logger.read_data(segment)
     print(f"Read {len(data)} records from data.")
     bulk_data = bulk_stats_logger.bulk(data)
     bulk_stats_logger.write_data(bulk_data)
-    bulk_stats_logger.clear_data()
     print(f"Wrote {len(bulk_data)} records to bulk data.")
+    # a running logger resets its own summaries once it notices the rotation
+    OnlineAggregator().checkpoint(AGGREGATE_CHECKPOINT)
+    print("Cleared today's checkpointed aggregates.")
 
 
 if __name__ == "__main__":
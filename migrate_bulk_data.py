@@ -0,0 +1,37 @@
+import argparse
+import os
+import time
+
+from app.shared.aggregate_store import AggregateStore
+from app.shared.aggregate_utils import decode_aggregate
+from app.shared.constants import AGGREGATE_STORE, BULK_DATA
+from app.shared.read_json_lines import read_json_lines
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Convert the JSON lines bulk aggregates into the Parquet store"
+    )
+    parser.add_argument("--input", default=BULK_DATA)
+    parser.add_argument("--output", default=AGGREGATE_STORE)
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.input):
+        print(f"No bulk data at {args.input}.")
+        return
+    start = time.perf_counter()
+    with open(args.input, "rb") as file:
+        rows = [decode_aggregate(data_dict) for data_dict in read_json_lines(file)]
+    store = AggregateStore(args.output)
+    num_written = store.rewrite(rows)
+    duration = time.perf_counter() - start
+
+    print(
+        f"Wrote {num_written} records from {args.input} to {args.output} "
+        f"in {duration:.1f} s, {len(store.type_names())} types."
+    )
+    print('Set BULK_ENGINE = "parquet" in app/shared/constants.py to use it.')
+
+
+if __name__ == "__main__":
+    main()
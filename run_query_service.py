@@ -0,0 +1,4 @@
+from app.query_service.query_server import main
+
+if __name__ == "__main__":
+    main()
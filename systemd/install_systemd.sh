@@ -15,14 +15,17 @@ SERVICE_ROOT_DIR=/etc/systemd/system/
 mkdir -p ${SERVICE_ROOT_DIR}
 cp ${BASE_DIR}/server_dashboard_logger.service ${SERVICE_ROOT_DIR}
 cp ${BASE_DIR}/server_dashboard_frontend.service ${SERVICE_ROOT_DIR}
+cp ${BASE_DIR}/server_dashboard_query.service ${SERVICE_ROOT_DIR}
 
 echo "Enabling systemd services"
 systemctl daemon-reload
 loginctl enable-linger $USER
 systemctl enable server_dashboard_logger.service
 systemctl enable server_dashboard_frontend.service
+systemctl enable server_dashboard_query.service
 
 systemctl restart server_dashboard_logger.service
 systemctl restart server_dashboard_frontend.service
+systemctl restart server_dashboard_query.service
 
 echo "server_dashboard systemd services installation complete"
@@ -10,13 +10,16 @@ SERVICE_ROOT_DIR=/etc/systemd/system/
 
 rm ${SERVICE_ROOT_DIR}/server_dashboard_logger.service
 rm ${SERVICE_ROOT_DIR}/server_dashboard_frontend.service
+rm ${SERVICE_ROOT_DIR}/server_dashboard_query.service
 
 echo "Disabling systemd services"
 systemctl daemon-reload
 systemctl stop server_dashboard_logger.service
 systemctl stop server_dashboard_frontend.service
+systemctl stop server_dashboard_query.service
 
 systemctl disable server_dashboard_logger.service
 systemctl disable server_dashboard_frontend.service
+systemctl disable server_dashboard_query.service
 
 echo "server_dashboard systemd services uninstallation complete"
@@ -0,0 +1,85 @@
+import math
+from datetime import datetime
+
+from app.data_logger.bulk_stats_logger import BulkStatsLogger
+from app.shared import CpuData, NetworkData
+from app.shared.aggregate_utils import get_series_key, group_by_date
+from app.shared.online_aggregator import OnlineAggregator
+
+DAY_START = datetime(2024, 5, 1).timestamp()
+NAN = float("nan")
+
+
+def day_of_rows() -> list:
+    rows = []
+    for minute in range(60):
+        timestamp = DAY_START + minute * 60.0
+        temperature = NAN if minute % 7 == 0 else 40.0 + minute % 11
+        rows.append(
+            CpuData(
+                timestamp=timestamp,
+                utilization=float(minute % 100),
+                memory_free=1000.0,
+                memory_used=float(minute),
+                temperature=temperature,
+            )
+        )
+        ping = NAN if minute % 5 == 0 else 10.0 + minute % 3
+        rows.append(NetworkData(timestamp, "gateway", ping))
+        rows.append(NetworkData(timestamp, "unreachable", NAN))
+    # a NaN as the first row of a field must not hide the peak
+    rows.append(NetworkData(DAY_START + 3700.0, "gateway", 20.0))
+    return rows
+
+
+def by_series(aggregates: list) -> dict:
+    return {(row.type, get_series_key(row)): row.to_dict() for row in aggregates}
+
+
+def assert_same(online: dict, batch: dict) -> None:
+    assert online.keys() == batch.keys()
+    for key, fields in online.items():
+        for name, value in fields.items():
+            other = batch[key][name]
+            if isinstance(value, float) and math.isnan(value):
+                assert isinstance(other, float) and math.isnan(other), (key, name)
+            else:
+                assert value == other, (key, name)
+
+
+def test_batch_matches_online(tmp_path):
+    rows = day_of_rows()
+    aggregator = OnlineAggregator()
+    checkpoint = str(tmp_path / "aggregates.checkpoint.json")
+    for index, row in enumerate(rows):
+        aggregator.add(row)
+        if index == len(rows) // 2:
+            # the logger restarts from its checkpoint halfway through the day
+            aggregator.checkpoint(checkpoint)
+            aggregator = OnlineAggregator.from_checkpoint(checkpoint)
+    online = by_series(aggregator.flush())
+
+    batch = by_series(BulkStatsLogger("", "").bulk(rows, group_by_date))
+
+    assert_same(online, batch)
+
+
+def test_nan_samples_are_skipped():
+    aggregates = by_series(BulkStatsLogger("", "").bulk(day_of_rows(), group_by_date))
+
+    gateway = aggregates[("NetworkAggregatedData", "gateway")]
+    assert gateway["peak_ping"] == 20.0
+    assert gateway["num_pings"] == 61
+    assert gateway["num_hits"] == 49
+    cpu = aggregates[("CpuAggregatedData", "default")]
+    assert cpu["peak_temperature"] == 50.0
+    assert not math.isnan(cpu["average_temperature"])
+
+
+def test_all_misses():
+    aggregates = by_series(BulkStatsLogger("", "").bulk(day_of_rows(), group_by_date))
+
+    unreachable = aggregates[("NetworkAggregatedData", "unreachable")]
+    assert unreachable["num_hits"] == 0
+    assert unreachable["percent_packet_loss"] == 100.0
+    assert math.isnan(unreachable["peak_ping"])
@@ -0,0 +1,48 @@
+import json
+
+from app.data_logger.rollup_pipeline import RollupPipeline, RollupTier
+
+NOW = 1_714_600_000.0
+
+
+def write_lines(path, lines: list[bytes]) -> None:
+    with open(path, "wb") as file:
+        file.write(b"".join(lines))
+
+
+def read_timestamps(path) -> list[float]:
+    with open(path, "rb") as file:
+        return [json.loads(line)["timestamp"] for line in file]
+
+
+def test_retention_drops_old_rows(tmp_path):
+    path = tmp_path / "rollup_1m.jsonl"
+    pipeline = RollupPipeline([RollupTier("1m", 60.0, str(path), 3600.0)])
+    write_lines(
+        path,
+        [json.dumps({"timestamp": NOW - age}).encode() + b"\n" for age in (7200, 60)],
+    )
+
+    pipeline.apply_retention(NOW)
+
+    assert read_timestamps(path) == [NOW - 60]
+
+
+def test_retention_skips_truncated_final_line(tmp_path):
+    path = tmp_path / "rollup_1m.jsonl"
+    pipeline = RollupPipeline([RollupTier("1m", 60.0, str(path), 3600.0)])
+    write_lines(
+        path,
+        [
+            json.dumps({"timestamp": NOW - 120}).encode() + b"\n",
+            b"not json\n",
+            json.dumps({"timestamp": NOW - 60}).encode() + b"\n",
+            b'{"timestamp": 17146',
+        ],
+    )
+
+    pipeline.apply_retention(NOW)
+
+    assert read_timestamps(path) == [NOW - 120, NOW - 60]
+    # rows appended afterwards start on a line of their own
+    assert path.read_bytes().endswith(b"\n")